@@ -5,6 +5,7 @@ from ._shared import (
     _hex_to_rgba,
     _normalize_team_color,
     format_lap_time_ms,
+    group_laps_by_driver,
 )
 from .comparison import (
     build_driver_narrative_chart,
@@ -48,4 +49,5 @@ __all__ = [
     "build_stint_chart",
     "build_tyre_degradation_chart",
     "format_lap_time_ms",
+    "group_laps_by_driver",
 ]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from functools import lru_cache
 
 import pandas as pd
 import plotly.graph_objects as go
@@ -65,7 +66,14 @@ def _contiguous_lap_ranges(laps: Iterable[int]) -> list[tuple[int, int]]:
 def _normalize_team_color(value: object) -> str:
     if value is None or pd.isna(value):
         return "#22C55E"
-    color = str(value).strip()
+    return _normalize_color_str(str(value))
+
+
+# Team colours come from a set of ~10 hex strings, so both helpers below are
+# memoized per process.  Arguments must be plain (hashable) str/float values.
+@lru_cache(maxsize=256)
+def _normalize_color_str(raw: str) -> str:
+    color = raw.strip()
     if color.startswith("#") and len(color) == 7:
         return color
     if len(color) == 6:
@@ -73,6 +81,7 @@ def _normalize_team_color(value: object) -> str:
     return "#22C55E"
 
 
+@lru_cache(maxsize=256)
 def _hex_to_rgba(hex_color: str, alpha: float) -> str:
     h = hex_color.lstrip("#")
     r, g, b = int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
@@ -157,24 +166,79 @@ def _add_sc_vsc_shading(
         )
 
 
+def group_laps_by_driver(lap_times_df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Split lap times into one frame per driver (single groupby pass).
+
+    Builders accept the result as ``laps_by_driver`` so a per-driver lookup
+    is a dict hit instead of a full-frame boolean mask.
+    """
+    if lap_times_df.empty:
+        return {}
+    return {
+        did: group.reset_index(drop=True)
+        for did, group in lap_times_df.groupby("driver_id", sort=False)
+    }
+
+
+def _driver_laps(
+    lap_times_df: pd.DataFrame,
+    driver_id: str | None,
+    laps_by_driver: dict[str, pd.DataFrame] | None = None,
+) -> pd.DataFrame:
+    """Return lap rows for one driver, using the pre-split dict when available."""
+    if laps_by_driver is not None:
+        return laps_by_driver.get(driver_id, lap_times_df.iloc[0:0])
+    return lap_times_df[lap_times_df["driver_id"] == driver_id]
+
+
 def _clean_race_laps(
     lap_times_df: pd.DataFrame,
     race_control_df: pd.DataFrame,
 ) -> pd.DataFrame:
-    """Filter to clean racing laps only (no pit laps, SC/VSC, or lap 1)."""
-    clean = lap_times_df.copy()
-    clean = clean[clean["lap_time_ms"].notna() & (clean["lap_time_ms"] > 0)]
-    clean = clean[clean["lap_number"] > 1]
-    pit_mask = clean["is_pit_in_lap"].fillna(False) | clean["is_pit_out_lap"].fillna(False)
-    clean = clean[~pit_mask]
-    if not race_control_df.empty:
-        sc_mask = race_control_df["is_sc"].fillna(False) | race_control_df["is_vsc"].fillna(False)
-        sc_laps = set(race_control_df[sc_mask]["lap_number"].astype(int).tolist())
+    """Filter to clean racing laps only (no pit laps, SC/VSC, or lap 1).
+
+    Relies on the ``is_clean_lap`` flag added by ``load_race_bundle``; only the
+    SC/VSC exclusion is applied here.  Returns a copy, as callers add columns.
+    """
+    keep = lap_times_df["is_clean_lap"]
+    sc_laps = _sc_vsc_laps(race_control_df)
+    if sc_laps:
+        keep = keep & ~lap_times_df["lap_number"].isin(sc_laps)
+    return lap_times_df[keep].copy()
+
+
+def _clean_driver_laps(
+    laps_by_driver: dict[str, pd.DataFrame],
+    driver_ids: set[str],
+    race_control_df: pd.DataFrame,
+) -> dict[str, pd.DataFrame]:
+    """Clean racing laps for ``driver_ids``, cut from a pre-split dict.
+
+    Same filter as ``_clean_race_laps`` but only the requested drivers are
+    touched; drivers without a clean lap are left out.  Returns copies.
+    """
+    sc_laps = _sc_vsc_laps(race_control_df)
+    clean: dict[str, pd.DataFrame] = {}
+    for driver_id in driver_ids:
+        group = laps_by_driver.get(driver_id)
+        if group is None:
+            continue
+        keep = group["is_clean_lap"]
         if sc_laps:
-            clean = clean[~clean["lap_number"].isin(sc_laps)]
+            keep = keep & ~group["lap_number"].isin(sc_laps)
+        if keep.any():
+            clean[driver_id] = group[keep].reset_index(drop=True)
     return clean
 
 
+def _sc_vsc_laps(race_control_df: pd.DataFrame) -> set[int]:
+    """Lap numbers run under a Safety Car or Virtual Safety Car."""
+    if race_control_df.empty:
+        return set()
+    sc_mask = race_control_df["is_sc"].fillna(False) | race_control_df["is_vsc"].fillna(False)
+    return set(race_control_df[sc_mask]["lap_number"].astype(int).tolist())
+
+
 def _focus_driver_ids(
     results_df: pd.DataFrame,
     highlight_top_n: int,
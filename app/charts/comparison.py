@@ -12,6 +12,7 @@ from ._shared import (
     COMPOUND_COLORS,
     _add_sc_vsc_shading,
     _clean_race_laps,
+    _driver_laps,
     _format_sector_ms,
     _hex_to_rgba,
     _normalize_team_color,
@@ -28,6 +29,7 @@ def build_driver_narrative_chart(
     race_control_df: pd.DataFrame,
     driver_id: str,
     compare_driver_id: str | None = None,
+    laps_by_driver: dict[str, pd.DataFrame] | None = None,
 ) -> go.Figure:
     """Lap-by-lap story: compound-colored stints for the primary driver,
     with an optional team-color pace overlay for a comparison driver.
@@ -43,7 +45,7 @@ def build_driver_narrative_chart(
 
     # --- Comparison driver overlay (drawn first → sits behind primary) ---
     if compare_driver_id:
-        cmp = lap_times_df[lap_times_df["driver_id"] == compare_driver_id].copy()
+        cmp = _driver_laps(lap_times_df, compare_driver_id, laps_by_driver).copy()
         cmp = cmp[cmp["lap_time_ms"].notna() & (cmp["lap_time_ms"] > 0)]
         if not cmp.empty:
             cmp["lap_sec"] = cmp["lap_time_ms"].astype(float) / 1000.0
@@ -86,7 +88,7 @@ def build_driver_narrative_chart(
             )
 
     # --- Primary driver (compound-colored stint traces, full treatment) ---
-    drv = lap_times_df[lap_times_df["driver_id"] == driver_id].copy()
+    drv = _driver_laps(lap_times_df, driver_id, laps_by_driver).copy()
     drv = drv[drv["lap_time_ms"].notna() & (drv["lap_time_ms"] > 0)]
 
     if drv.empty and not all_y_vals:
@@ -209,11 +211,12 @@ def build_driver_sector_heatmap(
     lap_times_df: pd.DataFrame,
     driver_id: str,
     race_control_df=None,
+    laps_by_driver: dict[str, pd.DataFrame] | None = None,
 ) -> go.Figure:
     """Per-lap sector heatmap for a single driver."""
     figure = go.Figure()
 
-    drv = lap_times_df[lap_times_df["driver_id"] == driver_id].copy()
+    drv = _driver_laps(lap_times_df, driver_id, laps_by_driver)
     drv = drv.dropna(subset=["sector1_ms", "sector2_ms", "sector3_ms"])
     drv = drv[drv["lap_time_ms"].notna() & (drv["lap_time_ms"] > 0)]
 
@@ -259,14 +262,10 @@ def build_driver_sector_heatmap(
             label += f"  ({', '.join(tags)})"
         lap_labels.append(label)
 
-    z_vals: list[list[float]] = []
-    text_vals: list[list[str]] = []
     sectors = ["sector1_ms", "sector2_ms", "sector3_ms"]
-    best = [drv[s].min() for s in sectors]
-
-    for _, row in drv.iterrows():
-        z_vals.append([(row[s] - best[i]) / 1000.0 for i, s in enumerate(sectors)])
-        text_vals.append([_format_sector_ms(row[s]) for s in sectors])
+    sector_ms = drv[sectors].to_numpy(dtype=float)
+    z_vals = ((sector_ms - sector_ms.min(axis=0)) / 1000.0).tolist()
+    text_vals = [[_format_sector_ms(v) for v in row] for row in sector_ms]
 
     col_labels = ["Sector 1", "Sector 2", "Sector 3"]
 
@@ -315,6 +314,7 @@ def build_gap_to_leader_chart(
     team_color: str = "#60A5FA",
     compare_driver_id: str | None = None,
     compare_team_color: str = "#F97316",
+    laps_by_driver: dict[str, pd.DataFrame] | None = None,
 ) -> go.Figure:
     """Gap between selected driver(s) and the race leader.
 
@@ -335,45 +335,49 @@ def build_gap_to_leader_chart(
     valid = valid.sort_values(["driver_id", "lap_number"])
     valid["cum_ms"] = valid.groupby("driver_id")["lap_time_ms"].cumsum()
 
-    # Use the position column (from fact_lap) to identify the actual leader
-    leader_df = (
-        valid[valid["position"] == 1]
-        .drop_duplicates("lap_number", keep="first")[["lap_number", "cum_ms", "driver_id"]]
-        .rename(columns={"cum_ms": "leader_cum", "driver_id": "leader_id"})
-    )
+    # Use the position column (from fact_lap) to identify the actual leader.
+    # Leader cumulative time / id are laid out as lap-indexed arrays so each
+    # driver's gap is a single fancy-indexed subtraction rather than a merge.
+    leader_df = valid[valid["position"] == 1].drop_duplicates("lap_number", keep="first")
+    max_lap = int(valid["lap_number"].max())
+    leader_laps = leader_df["lap_number"].to_numpy(dtype=int)
+    leader_cum = np.full(max_lap + 1, np.nan)
+    leader_cum[leader_laps] = leader_df["cum_ms"].to_numpy(dtype=float)
+    leader_id = np.full(max_lap + 1, None, dtype=object)
+    leader_id[leader_laps] = leader_df["driver_id"].to_numpy()
 
     # Build list of drivers to plot: (driver_id, raw_color, is_primary)
     drivers_to_plot = [(driver_id, team_color, True)]
     if compare_driver_id:
         drivers_to_plot.append((compare_driver_id, compare_team_color, False))
 
-    max_lap = int(valid["lap_number"].max())
     any_plotted = False
 
     for did, raw_color, is_primary in drivers_to_plot:
-        drv = valid[valid["driver_id"] == did][["lap_number", "cum_ms"]].rename(
-            columns={"cum_ms": "drv_cum"}
-        )
-        if drv.empty:
+        # The plotted drivers' own cumulative times come from the shared
+        # split; only the leader lookup above needs the whole field
+        drv_rows = _driver_laps(lap_times_df, did, laps_by_driver)
+        drv_rows = drv_rows[
+            drv_rows["lap_time_ms"].notna() & (drv_rows["lap_time_ms"] > 0)
+        ].sort_values("lap_number")
+        if drv_rows.empty:
             continue
 
-        merged = drv.merge(leader_df, on="lap_number", how="inner")
-        if merged.empty:
+        laps = drv_rows["lap_number"].to_numpy(dtype=int)
+        has_leader = ~np.isnan(leader_cum[laps])
+        if not has_leader.any():
             continue
+        laps = laps[has_leader]
+        drv_cum = drv_rows["lap_time_ms"].cumsum().to_numpy(dtype=float)[has_leader]
 
         # Gap = 0 when driver IS the leader, positive when behind
-        is_leading = merged["leader_id"] == did
-        merged["gap_sec"] = np.where(
-            is_leading,
-            0.0,
-            (merged["drv_cum"] - merged["leader_cum"]) / 1000.0,
-        )
+        is_leading = leader_id[laps] == did
+        gap_sec = np.where(is_leading, 0.0, (drv_cum - leader_cum[laps]) / 1000.0)
 
-        gap_series = merged[["lap_number", "gap_sec"]].rename(columns={"lap_number": "lap"})
+        gap_series = pd.DataFrame({"lap": laps, "gap_sec": gap_sec})
         color = _normalize_team_color(raw_color)
 
         # Get driver code (legend) and full name (hover)
-        drv_rows = valid[valid["driver_id"] == did]
         code = "DRV"
         full_name = "DRV"
         if "driver_code" in drv_rows.columns and not drv_rows.empty:
@@ -468,29 +472,35 @@ def build_lap_delta_chart(
     """Per-lap delta between two drivers.  Positive = A slower, negative = A faster."""
     figure = go.Figure()
 
-    clean = _clean_race_laps(lap_times_df, race_control_df)
+    # Narrow to the two drivers first so the clean-lap mask only scans their rows
+    both = lap_times_df[lap_times_df["driver_id"].isin([driver_a_id, driver_b_id])]
+    clean = _clean_race_laps(both, race_control_df)
     if clean.empty:
         figure.update_layout(**_CHART_LAYOUT)
         return figure
 
-    a = clean[clean["driver_id"] == driver_a_id][["lap_number", "lap_time_ms"]].rename(
-        columns={"lap_time_ms": "a_ms"}
-    )
-    b = clean[clean["driver_id"] == driver_b_id][["lap_number", "lap_time_ms"]].rename(
-        columns={"lap_time_ms": "b_ms"}
-    )
-    merged = a.merge(b, on="lap_number").sort_values("lap_number")
-    if merged.empty:
+    # Scatter each driver's laps into a lap-indexed array; laps both drivers
+    # completed cleanly are where neither slot is NaN
+    max_lap = int(clean["lap_number"].max())
+    lap_ms = {}
+    for did in (driver_a_id, driver_b_id):
+        drv = clean[clean["driver_id"] == did]
+        arr = np.full(max_lap + 1, np.nan)
+        arr[drv["lap_number"].to_numpy(dtype=int)] = drv["lap_time_ms"].to_numpy(dtype=float)
+        lap_ms[did] = arr
+    delta_ms = lap_ms[driver_a_id] - lap_ms[driver_b_id]
+    laps = np.flatnonzero(~np.isnan(delta_ms))
+    if laps.size == 0:
         figure.update_layout(**_CHART_LAYOUT)
         return figure
 
-    merged["delta_sec"] = (merged["a_ms"] - merged["b_ms"]).astype(float) / 1000.0
-    bar_colors = ["#EF4444" if d > 0 else "#22C55E" for d in merged["delta_sec"]]
+    delta_sec = delta_ms[laps] / 1000.0
+    bar_colors = np.where(delta_sec > 0, "#EF4444", "#22C55E")
 
     figure.add_trace(
         go.Bar(
-            x=merged["lap_number"],
-            y=merged["delta_sec"],
+            x=laps,
+            y=delta_sec,
             marker_color=bar_colors,
             showlegend=False,
             hovertemplate="<b>Lap %{x}</b><br>Delta: %{y:+.3f}s<extra></extra>",
@@ -518,9 +528,8 @@ def build_lap_delta_chart(
     # Pit lap markers — extract from raw data before cleaning.
     # Offset driver A above zero and driver B below so both are visible
     # when they pit on the same lap.
-    both = lap_times_df[lap_times_df["driver_id"].isin([driver_a_id, driver_b_id])]
     pit_in = both[both["is_pit_in_lap"].fillna(False)]
-    y_range = merged["delta_sec"].abs().max()
+    y_range = np.abs(delta_sec).max()
     pit_offset = max(y_range * 0.06, 0.02)
 
     for did, label, color, offset in zip(
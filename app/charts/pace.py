@@ -9,6 +9,7 @@ from ._shared import (
     _H_LEGEND,
     _ZEROLINE,
     _add_sc_vsc_shading,
+    _clean_driver_laps,
     _clean_race_laps,
     _driver_short,
     _focus_driver_ids,
@@ -16,6 +17,7 @@ from ._shared import (
     _hex_to_rgba,
     _normalize_team_color,
     format_lap_time_ms,
+    group_laps_by_driver,
 )
 
 
@@ -57,10 +59,15 @@ def build_race_pace_chart(
 
     max_lap = int(clean["lap_number"].max())
 
+    # Split once; both passes below walk the same per-driver frames
+    focus_groups = [
+        (driver_id, group)
+        for driver_id, group in group_laps_by_driver(clean).items()
+        if driver_id in focus_ids
+    ]
+
     # Pass 1: faded scatter dots (rendered first → behind the lines)
-    for driver_id, group in clean.groupby("driver_id", sort=False):
-        if driver_id not in focus_ids:
-            continue
+    for _driver_id, group in focus_groups:
         first_row = group.iloc[0]
         team_color = _normalize_team_color(first_row.get("team_color"))
 
@@ -76,9 +83,7 @@ def build_race_pace_chart(
         )
 
     # Pass 2: rolling-median trend lines (primary visual, drawn on top)
-    for driver_id, group in clean.groupby("driver_id", sort=False):
-        if driver_id not in focus_ids:
-            continue
+    for _driver_id, group in focus_groups:
         first_row = group.iloc[0]
         label = _driver_short(first_row)
         team_color = _normalize_team_color(first_row.get("team_color"))
@@ -175,7 +180,7 @@ def build_sector_heatmap(
 
     # Merge driver names and sort by finish position
     if not results_df.empty:
-        name_cols = results_df[["driver_id", "full_name", "driver_code", "finish_position"]].copy()
+        name_cols = results_df[["driver_id", "full_name", "driver_code", "finish_position"]]
         sectors = sectors.merge(name_cols, on="driver_id", how="left")
         sectors = sectors.sort_values("finish_position", na_position="last")
 
@@ -256,17 +261,22 @@ def build_lap_distribution_chart(
     race_control_df: pd.DataFrame,
     highlight_top_n: int = 10,
     highlight_driver_ids: set[str] | None = None,
+    laps_by_driver: dict[str, pd.DataFrame] | None = None,
 ) -> go.Figure:
     """Horizontal box plot of clean lap time distributions per driver."""
     figure = go.Figure()
 
-    clean = _clean_race_laps(lap_times_df, race_control_df)
-    if clean.empty:
+    focus_ids = _focus_driver_ids(results_df, highlight_top_n, highlight_driver_ids)
+
+    # Only the focus drivers are plotted, so only their laps are cleaned
+    if laps_by_driver is None:
+        laps_by_driver = group_laps_by_driver(lap_times_df)
+    laps_by_driver = _clean_driver_laps(laps_by_driver, focus_ids, race_control_df)
+    if not laps_by_driver:
         figure.update_layout(**_CHART_LAYOUT)
         return figure
-
-    clean["lap_sec"] = clean["lap_time_ms"].astype(float) / 1000.0
-    focus_ids = _focus_driver_ids(results_df, highlight_top_n, highlight_driver_ids)
+    for group in laps_by_driver.values():
+        group["lap_sec"] = group["lap_time_ms"].astype(float) / 1000.0
 
     # Ordered focus driver list (by finish position)
     if not results_df.empty:
@@ -275,14 +285,10 @@ def build_lap_distribution_chart(
     else:
         driver_order = list(focus_ids)
 
-    focus_data = clean[clean["driver_id"].isin(focus_ids)]
-    if focus_data.empty:
-        figure.update_layout(**_CHART_LAYOUT)
-        return figure
-
     # X-axis range from focus driver data
-    p01 = focus_data["lap_sec"].quantile(0.01)
-    p99 = focus_data["lap_sec"].quantile(0.99)
+    focus_sec = pd.concat([group["lap_sec"] for group in laps_by_driver.values()])
+    p01 = focus_sec.quantile(0.01)
+    p99 = focus_sec.quantile(0.99)
     x_pad = (p99 - p01) * 0.1
     x_min = max(p01 - x_pad, 0)
     x_max = p99 + x_pad
@@ -292,8 +298,8 @@ def build_lap_distribution_chart(
     hover_data = []
 
     for driver_id in reversed(driver_order):
-        group = clean[clean["driver_id"] == driver_id]
-        if group.empty:
+        group = laps_by_driver.get(driver_id)
+        if group is None or group.empty:
             continue
         first = group.iloc[0]
         label = _driver_short(first)
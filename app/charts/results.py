@@ -24,8 +24,7 @@ def build_grid_finish_chart(
         figure.update_layout(**_CHART_LAYOUT)
         return figure
 
-    df = results_df.copy()
-    df = df.dropna(subset=["grid_position", "finish_position"])
+    df = results_df.dropna(subset=["grid_position", "finish_position"]).copy()
     df["grid_position"] = df["grid_position"].astype(int)
     df["finish_position"] = df["finish_position"].astype(int)
     df = df.sort_values("finish_position", ascending=False)  # P1 at top
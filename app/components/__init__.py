@@ -1,10 +1,13 @@
 """Reusable UI components for F1 Race Decoder dashboard."""
 
 from .banner import render_banner
+from .captions import CAPTIONS, chart_caption
 from .driver_selector import driver_selector
 from .metrics import derive_race_stats, metric_html, render_summary
 
 __all__ = [
+    "CAPTIONS",
+    "chart_caption",
     "derive_race_stats",
     "driver_selector",
     "metric_html",
@@ -6,19 +6,14 @@ import pandas as pd
 import streamlit as st
 
 
-def render_banner(selected_race: pd.Series, r: pd.Series) -> None:
+def render_banner(race: pd.Series) -> None:
     """Render the race header banner with optional Wikipedia/F1.com links."""
-    race_dt = pd.to_datetime(r["race_datetime_utc"], utc=True)
-    date_str = race_dt.strftime("%d %B %Y")
+    date_str = race["race_datetime_utc"].strftime("%d %B %Y")
 
-    wiki_url = (
-        selected_race.get("wikipedia_url") if pd.notna(selected_race.get("wikipedia_url")) else None
-    )
-    f1_url = (
-        selected_race.get("formula1_url") if pd.notna(selected_race.get("formula1_url")) else None
-    )
+    wiki_url = race.get("wikipedia_url") if pd.notna(race.get("wikipedia_url")) else None
+    f1_url = race.get("formula1_url") if pd.notna(race.get("formula1_url")) else None
 
-    event_short = r["event_name"].replace(" Grand Prix", " GP")
+    event_short = race["event_name"].replace(" Grand Prix", " GP")
 
     banner_links = ""
     if wiki_url or f1_url:
@@ -43,8 +38,8 @@ def render_banner(selected_race: pd.Series, r: pd.Series) -> None:
         f"""
         <div class="race-banner">
             <div>
-                <h1>Round {int(r['round'])} &middot; {r['event_name']}</h1>
-                <p>{r['country']} &middot; {r['circuit']} &middot; {date_str}</p>
+                <h1>Round {int(race['round'])} &middot; {race['event_name']}</h1>
+                <p>{race['country']} &middot; {race['circuit']} &middot; {date_str}</p>
             </div>
             {banner_links}
         </div>
@@ -0,0 +1,122 @@
+"""Static chart captions, keyed by chart.
+
+Captions that interpolate driver names stay inline in their tab.
+"""
+
+from __future__ import annotations
+
+import streamlit as st
+
+CAPTIONS: dict[str, str] = {
+    # Race Story
+    "position": (
+        "Where each driver ran throughout the race. "
+        "P1 (the leader) is at the top. "
+        "Watch for lines crossing each other "
+        "to spot overtakes."
+    ),
+    "leader_gap": (
+        "The time gap between the race leader and the driver in second. "
+        "When the line rises, the leader is pulling away. "
+        "When it drops, P2 is closing in, "
+        "signalling an exciting battle for the lead."
+    ),
+    # Race Pace
+    "pace": (
+        "Each line shows a driver's smoothed pace across the race. "
+        "Lower means faster. "
+        "Faded dots are individual lap times. "
+        "Pit stops, safety car laps, and the opening lap are removed "
+        "to show true racing speed."
+    ),
+    "consistency": (
+        "How consistent was each driver's pace? "
+        "The box shows the typical range of lap times. "
+        "a narrow box means very steady driving. "
+        "The vertical line inside each box is the median "
+        "(typical) lap time. Further left = faster."
+    ),
+    "sectors": (
+        "Every lap is split into 3 sectors. "
+        "This heatmap shows each driver's typical time in each sector. "
+        "Green = closest to the fastest time in that sector, "
+        "red = furthest behind. "
+        "Helps you see which part of the track each driver excels at."
+    ),
+    # Strategy
+    "stints": (
+        "Each bar is a stint (the period between pit stops). "
+        "Teams choose from three dry slick compounds: "
+        '<span style="color:#FF3333;font-weight:700;">Soft</span> '
+        "(fastest, wears out quickly), "
+        '<span style="color:#FFC300;font-weight:700;">Medium</span> '
+        "(balanced), and "
+        '<span style="color:#F0F0F0;font-weight:700;">Hard</span> '
+        "(slowest but lasts longest). "
+        "In wet conditions, teams switch to "
+        '<span style="color:#39D353;font-weight:700;">Intermediate</span> '
+        "(light rain or a drying track) or "
+        '<span style="color:#4A90D9;font-weight:700;">Wet</span> '
+        "(heavy rain with standing water). "
+        '<span style="color:#94A3B8;font-weight:700;">Gray</span> '
+        "bars indicate laps where tyre data was unavailable. "
+        "Diamond markers show pit stops. "
+        "Drivers sorted by finishing position (winner at top)."
+    ),
+    "pit_duration": (
+        "Time spent in the pit lane for each stop. "
+        "Shorter bars mean a faster pit crew or a cleaner stop. "
+        "A slow pit stop can cost a driver positions and "
+        "even decide the outcome of a race."
+    ),
+    "tyre_degradation": (
+        "As tyres wear out, lap times get slower. "
+        "This chart shows how quickly each compound loses performance. "
+        "Steeper upward trends mean faster degradation. "
+        "Teams use this data to decide when to pit."
+    ),
+    # Driver Deep Dive
+    "h2h_sectors": (
+        "Median sector times head-to-head. Shows where each "
+        "driver gained or lost time on the track."
+    ),
+    "narrative": (
+        "Lap-by-lap pace colored by tyre compound. "
+        "Dashed orange lines mark pit stops. "
+        "Look for how pace changes after each stop and "
+        "during safety car periods."
+    ),
+    "gap_to_leader": (
+        "Time gap to the race leader throughout the race. "
+        "The line sits at zero when this driver IS the leader. "
+        "When behind, it rises to show how many seconds back "
+        "they are. Spikes typically correspond to pit stop "
+        "windows."
+    ),
+    "driver_sectors": (
+        "Each cell shows a sector time for a specific lap. "
+        "Green = close to personal best, red = further away. "
+        "Pit laps are excluded (distorted times). "
+        "SC/VSC and pit-adjacent laps are labelled."
+    ),
+    # Full Results
+    "grid_finish": (
+        "Where each driver started (open circle) versus where they "
+        "finished (filled circle). "
+        '<span style="color:#22C55E;font-weight:700;">Green</span> = '
+        "gained positions, "
+        '<span style="color:#EF4444;font-weight:700;">Red</span> = '
+        "lost positions."
+    ),
+    "classification": (
+        "Final standings with positions gained or lost from the starting " "grid to the finish."
+    ),
+}
+
+
+def chart_caption(key: str) -> None:
+    """Render the static caption for ``key`` above its chart."""
+    st.markdown(
+        f'<p class="chart-caption" data-id="{key}">{CAPTIONS[key]}</p>',
+        unsafe_allow_html=True,
+    )
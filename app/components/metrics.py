@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from charts import format_lap_time_ms
@@ -36,25 +38,20 @@ def derive_race_stats(bundle: dict[str, pd.DataFrame]) -> RaceStats:
 
     total_laps = int(positions_df["lap_number"].max()) if not positions_df.empty else 0
     total_pit_stops = int(len(pit_df.index)) if not pit_df.empty else 0
-    neutralized_laps = (
-        int(race_control_df[["is_sc", "is_vsc"]].fillna(False).any(axis=1).sum())
-        if not race_control_df.empty
-        else 0
-    )
+    neutralized_laps = 0
+    if not race_control_df.empty:
+        sc = race_control_df["is_sc"].fillna(False).to_numpy(dtype=bool)
+        vsc = race_control_df["is_vsc"].fillna(False).to_numpy(dtype=bool)
+        neutralized_laps = int(np.count_nonzero(sc | vsc))
 
     # Fastest lap
     fastest_lap_str = "\u2014"
     fastest_lap_driver = ""
     if not lap_times_df.empty:
-        clean_laps = lap_times_df[
-            lap_times_df["lap_time_ms"].notna()
-            & (lap_times_df["lap_time_ms"] > 0)
-            & (lap_times_df["lap_number"] > 1)
-            & ~lap_times_df["is_pit_in_lap"].fillna(False)
-            & ~lap_times_df["is_pit_out_lap"].fillna(False)
-        ]
-        if not clean_laps.empty:
-            fastest_row = clean_laps.loc[clean_laps["lap_time_ms"].idxmin()]
+        lap_ms = lap_times_df["lap_time_ms"].to_numpy(dtype=float, na_value=np.nan)
+        clean = lap_times_df["is_clean_lap"].to_numpy(dtype=bool)
+        if clean.any():
+            fastest_row = lap_times_df.iloc[int(np.argmin(np.where(clean, lap_ms, np.inf)))]
             fastest_lap_str = format_lap_time_ms(fastest_row["lap_time_ms"])
             fname = fastest_row.get("full_name")
             fastest_lap_driver = (
@@ -64,24 +61,25 @@ def derive_race_stats(bundle: dict[str, pd.DataFrame]) -> RaceStats:
     # Lead changes
     lead_changes = 0
     gap_df = bundle["gap"]
-    if not gap_df.empty and "leader_driver_id" in gap_df.columns:
-        lead_changes = max(
-            0,
-            int((gap_df["leader_driver_id"] != gap_df["leader_driver_id"].shift()).sum()) - 1,
-        )
+    if len(gap_df) > 1 and "leader_driver_id" in gap_df.columns:
+        # Factorize to int codes so the neighbour compare is a plain int64 slice.
+        # Laps without a recorded leader are dropped first: factorize would code
+        # them -1 and count a change into and out of every gap.
+        leader_codes = pd.factorize(gap_df["leader_driver_id"].dropna())[0]
+        lead_changes = int((leader_codes[1:] != leader_codes[:-1]).sum())
 
     # Biggest mover
     biggest_mover_str = "\u2014"
     mover_name = ""
     gained_val = 0
     if not results_df.empty:
-        movers = results_df.dropna(subset=["grid_position", "finish_position"]).copy()
-        if not movers.empty:
-            movers["gained"] = movers["grid_position"].astype(int) - movers[
-                "finish_position"
-            ].astype(int)
-            best = movers.loc[movers["gained"].idxmax()]
-            gained_val = int(best["gained"])
+        grid = results_df["grid_position"].to_numpy(dtype=float, na_value=np.nan)
+        finish = results_df["finish_position"].to_numpy(dtype=float, na_value=np.nan)
+        gained = grid - finish
+        if not np.isnan(gained).all():
+            best_idx = int(np.nanargmax(gained))
+            best = results_df.iloc[best_idx]
+            gained_val = int(gained[best_idx])
             mover_name = (
                 str(best["full_name"]) if pd.notna(best["full_name"]) else str(best["driver_code"])
             )
@@ -96,13 +94,13 @@ def derive_race_stats(bundle: dict[str, pd.DataFrame]) -> RaceStats:
     track_temp_str = "\u2014"
     conditions_str = "\u2014"
     if not weather_df.empty:
-        avg_track = weather_df["track_temp_c"].mean()
-        if pd.notna(avg_track):
-            lo = weather_df["track_temp_c"].min()
-            hi = weather_df["track_temp_c"].max()
-            track_temp_str = f"{lo:.0f}\u2013{hi:.0f}\u00b0C"
-        rain_any = weather_df["rainfall"].fillna(False).any()
-        rain_all = weather_df["rainfall"].fillna(False).all()
+        track = weather_df["track_temp_c"].agg(["min", "max"])
+        if pd.notna(track["min"]):
+            track_temp_str = f"{track['min']:.0f}\u2013{track['max']:.0f}\u00b0C"
+        # Missing rainfall readings count as dry
+        rain = weather_df["rainfall"].fillna(False).to_numpy(dtype=bool)
+        rain_any = rain.any()
+        rain_all = rain.all()
         if rain_all:
             conditions_str = "Wet"
         elif rain_any:
@@ -114,22 +112,17 @@ def derive_race_stats(bundle: dict[str, pd.DataFrame]) -> RaceStats:
     podium_df = results_df[results_df["finish_position"].isin([1, 2, 3])].sort_values(
         "finish_position"
     )
-
-    def _podium_entry(row: pd.Series) -> dict:
-        name = row.get("full_name")
-        if pd.isna(name):
-            name = row.get("driver_code", "\u2014")
-        team = row.get("team_name", "")
-        if pd.isna(team):
-            team = ""
-        color = row.get("team_color", "#E10600")
-        if pd.isna(color):
-            color = "#E10600"
-        elif not str(color).startswith("#"):
-            color = f"#{color}"
-        return {"name": str(name), "team": str(team), "color": str(color)}
-
-    podium_entries = [_podium_entry(podium_df.iloc[i]) for i in range(len(podium_df))]
+    colors = podium_df["team_color"].fillna("#E10600").astype(str)
+    podium_entries = pd.DataFrame(
+        {
+            "name": podium_df["full_name"]
+            .fillna(podium_df["driver_code"])
+            .fillna("\u2014")
+            .astype(str),
+            "team": podium_df["team_name"].fillna("").astype(str),
+            "color": colors.where(colors.str.startswith("#"), "#" + colors),
+        }
+    ).to_dict("records")
 
     return RaceStats(
         total_laps=total_laps,
@@ -147,6 +140,8 @@ def derive_race_stats(bundle: dict[str, pd.DataFrame]) -> RaceStats:
     )
 
 
+# Same cards are re-emitted on every rerun with identical (string) arguments
+@lru_cache(maxsize=256)
 def metric_html(
     label: str,
     value: str,
@@ -186,24 +181,23 @@ def render_summary(stats: RaceStats) -> None:
     # Build podium HTML
     podium_html = ""
     if len(s.podium_entries) >= 3:
-        p1, p2, p3 = s.podium_entries[0], s.podium_entries[1], s.podium_entries[2]
+        podium_cards = "".join(
+            f'<div class="compact-podium cp-{pos}">'
+            f'<div class="cp-badge">{pos.upper()}</div>'
+            f'<div class="cp-info">'
+            f'<div class="cp-driver">{p["name"]}</div>'
+            f'<div class="cp-team">'
+            f'<span class="cp-color-dot" '
+            f'style="background:{p["color"]}"></span>'
+            f'{p["team"]}</div>'
+            f"</div></div>\n"
+            for pos, p in zip(("p1", "p2", "p3"), s.podium_entries, strict=False)
+        )
         podium_html = (
-            '<div class="summary-podium">\n' '<div class="summary-section-title">Podium</div>\n'
+            '<div class="summary-podium">\n'
+            '<div class="summary-section-title">Podium</div>\n'
+            f"{podium_cards}</div>"
         )
-        for pos, p in [("p1", p1), ("p2", p2), ("p3", p3)]:
-            badge = pos.upper()
-            podium_html += (
-                f'<div class="compact-podium cp-{pos}">'
-                f'<div class="cp-badge">{badge}</div>'
-                f'<div class="cp-info">'
-                f'<div class="cp-driver">{p["name"]}</div>'
-                f'<div class="cp-team">'
-                f'<span class="cp-color-dot" '
-                f'style="background:{p["color"]}"></span>'
-                f'{p["team"]}</div>'
-                f"</div></div>\n"
-            )
-        podium_html += "</div>"
 
     # Build KPI HTML
     kpi_cards = [
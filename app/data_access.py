@@ -32,7 +32,7 @@ def get_races_for_season(season: int) -> pd.DataFrame:
         return query_df(
             """
             SELECT race_id, season, round, event_name, circuit, country, race_datetime_utc,
-                   wikipedia_url, formula1_url
+                   last_ingested_at, wikipedia_url, formula1_url
             FROM metadata.races_catalog
             WHERE season = :season
               AND session_type = 'R'
@@ -45,7 +45,8 @@ def get_races_for_season(season: int) -> pd.DataFrame:
         # Columns may not exist yet — fall back without link columns
         df = query_df(
             """
-            SELECT race_id, season, round, event_name, circuit, country, race_datetime_utc
+            SELECT race_id, season, round, event_name, circuit, country, race_datetime_utc,
+                   last_ingested_at
             FROM metadata.races_catalog
             WHERE season = :season
               AND session_type = 'R'
@@ -67,10 +68,8 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
             "gap": pd.read_sql(
                 text(
                     """
-                SELECT g.race_id,
-                       g.lap_number,
+                SELECT g.lap_number,
                        g.leader_driver_id,
-                       g.p2_driver_id,
                        g.gap_p2_to_leader_ms,
                        d1.driver_code AS leader_driver_code,
                        d1.full_name AS leader_full_name,
@@ -89,7 +88,7 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
             "race_control": pd.read_sql(
                 text(
                     """
-                SELECT race_id, lap_number, is_sc, is_vsc, is_red_flag, is_yellow_flag
+                SELECT lap_number, is_sc, is_vsc
                 FROM curated.fact_race_control
                 WHERE race_id = :race_id
                 ORDER BY lap_number
@@ -101,8 +100,7 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
             "pit_markers": pd.read_sql(
                 text(
                     """
-                SELECT f.race_id,
-                       f.driver_id,
+                SELECT f.driver_id,
                        f.lap_number,
                        d.driver_code,
                        d.full_name
@@ -150,11 +148,9 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
             "positions": pd.read_sql(
                 text(
                     """
-                SELECT p.race_id,
-                       p.driver_id,
+                SELECT p.driver_id,
                        p.lap_number,
                        p.position,
-                       p.team_id,
                        d.driver_code,
                        d.full_name,
                        t.team_color,
@@ -172,15 +168,12 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
             "stints": pd.read_sql(
                 text(
                     """
-                SELECT s.race_id,
-                       s.driver_id,
+                SELECT s.driver_id,
                        s.stint,
                        s.start_lap,
                        s.end_lap,
                        s.compound,
                        s.stint_laps,
-                       s.median_lap_ms,
-                       s.avg_lap_ms,
                        s.pit_lap,
                        d.driver_code,
                        d.full_name,
@@ -202,13 +195,10 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
                 text(
                     """
                 SELECT r.driver_id,
-                       r.team_id,
                        r.grid_position,
                        r.finish_position,
-                       r.classified_position,
                        r.status,
                        r.points,
-                       r.race_time_ms,
                        r.gap_to_winner_ms,
                        d.driver_code,
                        d.full_name,
@@ -227,8 +217,7 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
             "lap_times": pd.read_sql(
                 text(
                     """
-                SELECT f.race_id,
-                       f.driver_id,
+                SELECT f.driver_id,
                        f.lap_number,
                        f.lap_time_ms,
                        f.sector1_ms,
@@ -239,7 +228,6 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
                        f.position,
                        f.is_pit_in_lap,
                        f.is_pit_out_lap,
-                       f.is_accurate,
                        d.driver_code,
                        d.full_name,
                        t.team_name,
@@ -277,12 +265,7 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
             "weather": pd.read_sql(
                 text(
                     """
-                SELECT race_id,
-                       timestamp_utc,
-                       air_temp_c,
-                       track_temp_c,
-                       humidity_pct,
-                       rainfall
+                SELECT track_temp_c, rainfall
                 FROM curated.fact_weather_minute
                 WHERE race_id = :race_id
                 ORDER BY timestamp_utc
@@ -293,4 +276,26 @@ def load_race_bundle(race_id: str) -> dict[str, pd.DataFrame]:
             ),
         }
 
+    # Positions are INTEGER in the warehouse but arrive as float64 whenever a
+    # NULL is present; cast once here so consumers skip per-rerun coercion.
+    # A grid never exceeds a few dozen cars, so Int8 holds every position.
+    results = data["results"]
+    for col in ("grid_position", "finish_position"):
+        results[col] = results[col].astype("Int8")
+
+    # The clean-lap rule (timed, not lap 1, not an in/out lap) is shared by the
+    # pace charts, the fastest-lap card and the deep dive; derive it once here.
+    laps = data["lap_times"]
+    laps["is_clean_lap"] = (
+        (laps["lap_time_ms"] > 0)
+        & (laps["lap_number"] > 1)
+        & ~laps["is_pit_in_lap"].fillna(False).astype(bool)
+        & ~laps["is_pit_out_lap"].fillna(False).astype(bool)
+    )
+
+    # Lap numbers fit a small int; downcast only applies when no NULL forced float64
+    for key in ("lap_times", "positions", "pit_markers"):
+        frame = data[key]
+        frame["lap_number"] = pd.to_numeric(frame["lap_number"], downcast="integer")
+
     return data
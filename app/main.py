@@ -8,10 +8,15 @@ import streamlit as st
 from data_access import get_races_for_season, load_race_bundle
 from sqlalchemy.exc import ProgrammingError
 
+# Slices share buffers until written to, so the filtered views the charts and
+# stats take from cached bundle frames no longer allocate defensively.
+pd.options.mode.copy_on_write = True
+
 st.set_page_config(page_title="F1 Race Decoder", page_icon="🏎️", layout="wide")
 
+from charts import group_laps_by_driver  # noqa: E402
 from components import render_banner, render_summary  # noqa: E402
-from components.metrics import derive_race_stats  # noqa: E402
+from components.metrics import RaceStats, derive_race_stats  # noqa: E402
 from tabs import (  # noqa: E402
     driver_deep_dive,
     full_results,
@@ -27,19 +32,53 @@ inject_theme()
 # ---------------------------------------------------------------------------
 # Cached data helpers
 # Bump _BUNDLE_VERSION when the bundle schema changes (new keys, query edits)
-# to force cache invalidation.
+# to force cache invalidation.  It is passed as a hashed ``v`` argument (not
+# ``_v``, which Streamlit skips) so it also invalidates the on-disk tier.
 # ---------------------------------------------------------------------------
-_BUNDLE_VERSION = 2
+_BUNDLE_VERSION = 7
 
 
 @st.cache_data(show_spinner=False)
 def cached_races_for_season(season: int) -> pd.DataFrame:
-    return get_races_for_season(season)
+    df = get_races_for_season(season)
+    # Parse once here so the banner reads a ready Timestamp on every rerun
+    df["race_datetime_utc"] = pd.to_datetime(df["race_datetime_utc"], utc=True, format="ISO8601")
+    return df
+
+
+# Bundles only change when a race is re-ingested, so they are also persisted to
+# disk and survive app restarts instead of re-running every query cold.  The
+# catalog's last_ingested_at is part of every key, so a re-ingest misses both
+# tiers rather than serving a stale (or empty) bundle.  The tabs' figure caches
+# take the same (race_id, ingested_at, version) key.
+@st.cache_data(show_spinner=False, persist="disk")
+def _persisted_race_bundle(
+    race_id: str, ingested_at: str, v: int = _BUNDLE_VERSION
+) -> dict[str, pd.DataFrame]:
+    return load_race_bundle(race_id)
+
+
+# In-memory tier in front of the disk tier: cache_data hands back a fresh
+# unpickled copy of every frame on each hit, cache_resource shares one object.
+# The UI only reads bundle frames; anything that mutates must .copy() first.
+@st.cache_resource(show_spinner=False, max_entries=32)
+def cached_race_bundle(
+    race_id: str, ingested_at: str, v: int = _BUNDLE_VERSION
+) -> dict[str, pd.DataFrame]:
+    return _persisted_race_bundle(race_id, ingested_at, v)
 
 
 @st.cache_data(show_spinner=False)
-def cached_race_bundle(race_id: str, _v: int = _BUNDLE_VERSION) -> dict[str, pd.DataFrame]:
-    return load_race_bundle(race_id)
+def cached_race_stats(race_id: str, ingested_at: str, v: int = _BUNDLE_VERSION) -> RaceStats:
+    return derive_race_stats(cached_race_bundle(race_id, ingested_at))
+
+
+@st.cache_resource(show_spinner=False)
+def cached_laps_by_driver(
+    race_id: str, ingested_at: str, v: int = _BUNDLE_VERSION
+) -> dict[str, pd.DataFrame]:
+    # Shared read-only per-driver split; builders copy before mutating
+    return group_laps_by_driver(cached_race_bundle(race_id, ingested_at)["lap_times"])
 
 
 # ---------------------------------------------------------------------------
@@ -117,11 +156,10 @@ if season_races.empty:
     st.warning("No ingested races found for this season. " "Run `make ingest-single` first.")
     st.stop()
 
-round_options = season_races["round"].astype(int).tolist()
-round_labels = {
-    int(row.round): f"Round {int(row.round)} · {row.event_name}"
-    for row in season_races.itertuples()
-}
+_rounds = season_races["round"].astype(int)
+round_options = _rounds.tolist()
+_round_names = "Round " + _rounds.astype(str) + " · " + season_races["event_name"]
+round_labels = dict(zip(round_options, _round_names, strict=True))
 
 with _race_col:
     round_number = st.selectbox(
@@ -133,6 +171,7 @@ with _race_col:
 
 selected_race = season_races.loc[season_races["round"] == round_number].iloc[0]
 race_id = selected_race["race_id"]
+ingested_at = str(selected_race["last_ingested_at"])
 
 show_sc_vsc = True
 
@@ -140,7 +179,7 @@ show_sc_vsc = True
 # ---------------------------------------------------------------------------
 # Load race bundle
 # ---------------------------------------------------------------------------
-bundle = cached_race_bundle(race_id)
+bundle = cached_race_bundle(race_id, ingested_at)
 
 if bundle["drivers"].empty:
     st.error(
@@ -155,27 +194,20 @@ pit_df = bundle["pit_markers"]
 lap_times_df = bundle["lap_times"]
 
 # Build driver name ↔ id map (for multiselect)
-all_driver_names: list[str] = []
-driver_name_to_id: dict[str, str] = {}
-if not bundle["drivers"].empty:
-    for _, d in bundle["drivers"].iterrows():
-        name = (
-            str(d["full_name"]) if pd.notna(d.get("full_name")) else str(d.get("driver_code", "?"))
-        )
-        all_driver_names.append(name)
-        driver_name_to_id[name] = d["driver_id"]
+_drivers = bundle["drivers"]
+all_driver_names: list[str] = (
+    _drivers["full_name"].fillna(_drivers["driver_code"].astype(str)).astype(str).tolist()
+)
+driver_name_to_id: dict[str, str] = dict(
+    zip(all_driver_names, _drivers["driver_id"].tolist(), strict=True)
+)
 
 
 # ---------------------------------------------------------------------------
 # Derive stats + render banner and summary
 # ---------------------------------------------------------------------------
-race_row = season_races[season_races["race_id"] == race_id]
-if race_row.empty:
-    race_row = pd.DataFrame([selected_race])
-r = race_row.iloc[0]
-
-render_banner(selected_race, r)
-stats = derive_race_stats(bundle)
+render_banner(selected_race)
+stats = cached_race_stats(race_id, ingested_at)
 render_summary(stats)
 
 
@@ -193,7 +225,15 @@ tab_story, tab_pace, tab_strategy, tab_deep_dive, tab_results = st.tabs(
 )
 
 with tab_story:
-    race_story.render(bundle, all_driver_names, driver_name_to_id, show_sc_vsc)
+    race_story.render(
+        bundle,
+        all_driver_names,
+        driver_name_to_id,
+        show_sc_vsc,
+        race_id,
+        ingested_at,
+        _BUNDLE_VERSION,
+    )
 
 with tab_pace:
     race_pace.render(
@@ -204,16 +244,32 @@ with tab_pace:
         all_driver_names,
         driver_name_to_id,
         show_sc_vsc,
+        race_id,
+        ingested_at,
+        _BUNDLE_VERSION,
+        cached_laps_by_driver(race_id, ingested_at),
     )
 
 with tab_strategy:
-    strategy.render(bundle, results_df, lap_times_df, race_control_df)
+    strategy.render(
+        bundle, results_df, lap_times_df, race_control_df, race_id, ingested_at, _BUNDLE_VERSION
+    )
 
 with tab_deep_dive:
-    driver_deep_dive.render(bundle, results_df, lap_times_df, race_control_df, pit_df)
+    driver_deep_dive.render(
+        bundle,
+        results_df,
+        lap_times_df,
+        race_control_df,
+        pit_df,
+        race_id,
+        ingested_at,
+        _BUNDLE_VERSION,
+        cached_laps_by_driver(race_id, ingested_at),
+    )
 
 with tab_results:
-    full_results.render(results_df, race_id)
+    full_results.render(results_df, race_id, ingested_at, _BUNDLE_VERSION)
 
 # ---------------------------------------------------------------------------
 # Footer
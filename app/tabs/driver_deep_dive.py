@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 from charts import (
     _hex_to_rgba,
@@ -14,8 +16,83 @@ from charts import (
     build_sector_comparison_chart,
     format_lap_time_ms,
 )
+from components import chart_caption
 from components.metrics import metric_html
 
+# Head-to-head "A vs B" strip; only the colours and names vary per comparison
+_VS_BANNER_TEMPLATE = (
+    '<div style="background: linear-gradient(90deg, {pri_rgba}, {cmp_rgba});'
+    " border-radius: 10px; padding: 0.7rem 1.2rem; margin: 1rem 0 0.5rem 0;"
+    ' display: flex; justify-content: space-between; align-items: center;">'
+    '<span style="font-weight:700;color:{pri_color};">{pri_name}</span>'
+    '<span style="color:#9CA3AF; font-size:0.85rem;">vs</span>'
+    '<span style="font-weight:700;color:{cmp_color};">{cmp_name}</span>'
+    "</div>"
+)
+
+
+# Head-to-head figures are held by reference (no pickling) and keyed on the
+# bundle key + driver pair, so flipping back to a recent comparison is instant.
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _lap_delta_fig(
+    race_id: str,
+    ingested_at: str,
+    v: int,
+    driver_a_id: str,
+    driver_b_id: str,
+    labels: tuple[str, str],
+    colors: tuple[str, str],
+    _lap_times_df: pd.DataFrame,
+    _race_control_df: pd.DataFrame,
+) -> go.Figure:
+    return build_lap_delta_chart(
+        lap_times_df=_lap_times_df,
+        race_control_df=_race_control_df,
+        driver_a_id=driver_a_id,
+        driver_b_id=driver_b_id,
+        labels=labels,
+        colors=colors,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _sector_comparison_fig(
+    race_id: str,
+    ingested_at: str,
+    v: int,
+    driver_a_id: str,
+    driver_b_id: str,
+    labels: tuple[str, str],
+    colors: tuple[str, str],
+    _lap_times_df: pd.DataFrame,
+    _race_control_df: pd.DataFrame,
+) -> go.Figure:
+    return build_sector_comparison_chart(
+        lap_times_df=_lap_times_df,
+        race_control_df=_race_control_df,
+        driver_a_id=driver_a_id,
+        driver_b_id=driver_b_id,
+        labels=labels,
+        colors=colors,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _driver_summary(
+    race_id: str,
+    ingested_at: str,
+    v: int,
+    _lap_times_df: pd.DataFrame,
+    _pit_df: pd.DataFrame,
+) -> dict[str, dict]:
+    """Best clean lap and pit count for every driver, derived once per race."""
+    lap_ms = _lap_times_df["lap_time_ms"].to_numpy(dtype=float, na_value=np.nan)
+    clean = _lap_times_df["is_clean_lap"].to_numpy(dtype=bool)
+    best = pd.Series(lap_ms[clean]).groupby(_lap_times_df["driver_id"].to_numpy()[clean]).min()
+    summary = pd.DataFrame({"best_lap_ms": best, "pit_count": _pit_df["driver_id"].value_counts()})
+    summary["pit_count"] = summary["pit_count"].fillna(0).astype(int)
+    return summary.to_dict("index")
+
 
 @st.fragment
 def render(
@@ -24,208 +101,170 @@ def render(
     lap_times_df: pd.DataFrame,
     race_control_df: pd.DataFrame,
     pit_df: pd.DataFrame,
+    race_id: str,
+    ingested_at: str,
+    bundle_version: int,
+    laps_by_driver: dict[str, pd.DataFrame] | None = None,
 ) -> None:
     # Build position-prefixed driver labels for this tab
-    dd_labels: list[str] = []
-    dd_label_to_id: dict[str, str] = {}
+    dd_label_by_id: dict[str, str] = {}
     if not results_df.empty:
-        for _, _drow in results_df.iterrows():
-            _pos = _drow.get("finish_position")
-            _pos_str = f"P{int(_pos)}" if pd.notna(_pos) else "DNF"
-            _name = (
-                str(_drow["full_name"])
-                if pd.notna(_drow.get("full_name"))
-                else str(_drow.get("driver_code", "?"))
-            )
-            _team = str(_drow.get("team_name", "")) if pd.notna(_drow.get("team_name")) else ""
-            _lbl = f"{_pos_str} · {_name} ({_team})" if _team else f"{_pos_str} · {_name}"
-            dd_labels.append(_lbl)
-            dd_label_to_id[_lbl] = _drow["driver_id"]
+        _pos = results_df["finish_position"]
+        _pos_str = ("P" + _pos.astype("Int64").astype("string")).fillna("DNF")
+        _name = results_df["full_name"].fillna(results_df["driver_code"].astype(str)).astype(str)
+        _team = results_df["team_name"].fillna("").astype(str)
+        _team_str = (" (" + _team + ")").where(_team != "", "")
+        _lbl = _pos_str.astype(str) + " · " + _name + _team_str
+        dd_label_by_id = dict(zip(results_df["driver_id"], _lbl, strict=True))
+    dd_driver_ids = list(dd_label_by_id)
 
+    # Widgets hold driver ids directly; labels are display-only
     dd_col_a, dd_col_b = st.columns(2)
     with dd_col_a:
-        dd_primary_label = st.selectbox(
-            "Primary driver",
-            dd_labels,
-            index=0,
-            key="dd_primary",
+        dd_primary_id = (
+            st.selectbox(
+                "Primary driver",
+                dd_driver_ids,
+                index=0,
+                format_func=dd_label_by_id.get,
+                key="dd_primary",
+            )
+            or ""
         )
     with dd_col_b:
-        cmp_options = [lbl for lbl in dd_labels if lbl != dd_primary_label]
-        dd_compare_label = st.selectbox(
+        dd_compare_id = st.selectbox(
             "Compare with (optional)",
-            ["None"] + cmp_options,
+            [None] + [did for did in dd_driver_ids if did != dd_primary_id],
             index=0,
+            format_func=lambda did: "None" if did is None else dd_label_by_id[did],
             key="dd_compare",
         )
+    dd_primary_label = dd_label_by_id.get(dd_primary_id, "")
+    dd_compare_label = dd_label_by_id.get(dd_compare_id, "") if dd_compare_id else ""
 
-    dd_primary_id = dd_label_to_id.get(dd_primary_label, "")
-    dd_compare_id = dd_label_to_id.get(dd_compare_label) if dd_compare_label != "None" else None
+    # Per-driver result fields, looked up by id instead of re-scanning results_df
+    driver_meta: dict[str, dict] = (
+        results_df.drop_duplicates("driver_id").set_index("driver_id").to_dict("index")
+    )
+    dd_r = driver_meta.get(dd_primary_id)
+    dd_cmp_r = driver_meta.get(dd_compare_id) if dd_compare_id else None
 
     # Short names for chart descriptions
-    _pri_row = results_df[results_df["driver_id"] == dd_primary_id]
     dd_pri_name = (
-        str(_pri_row.iloc[0]["full_name"])
-        if not _pri_row.empty and pd.notna(_pri_row.iloc[0].get("full_name"))
-        else dd_primary_label
+        str(dd_r["full_name"]) if dd_r and pd.notna(dd_r.get("full_name")) else dd_primary_label
     )
     dd_cmp_name = ""
     if dd_compare_id:
-        _cmp_row = results_df[results_df["driver_id"] == dd_compare_id]
         dd_cmp_name = (
-            str(_cmp_row.iloc[0]["full_name"])
-            if not _cmp_row.empty and pd.notna(_cmp_row.iloc[0].get("full_name"))
+            str(dd_cmp_r["full_name"])
+            if dd_cmp_r and pd.notna(dd_cmp_r.get("full_name"))
             else dd_compare_label
         )
 
+    # Nothing to analyse without a primary driver (e.g. results not loaded)
+    if dd_r is None:
+        st.info("No results data available for this race.")
+        return
+
     # --- Summary cards ---
-    dd_row = results_df[results_df["driver_id"] == dd_primary_id]
-    dd_team_color = "#60A5FA"
-    if not dd_row.empty:
-        dd_r = dd_row.iloc[0]
-        dd_grid = int(dd_r["grid_position"]) if pd.notna(dd_r.get("grid_position")) else "-"
-        dd_finish = int(dd_r["finish_position"]) if pd.notna(dd_r.get("finish_position")) else "-"
-        dd_pts = int(dd_r["points"]) if pd.notna(dd_r.get("points")) else 0
-        dd_status = str(dd_r.get("status", "Finished"))
-        dd_team_color = _normalize_team_color(dd_r.get("team_color"))
+    dd_grid = int(dd_r["grid_position"]) if pd.notna(dd_r.get("grid_position")) else "-"
+    dd_finish = int(dd_r["finish_position"]) if pd.notna(dd_r.get("finish_position")) else "-"
+    dd_pts = int(dd_r["points"]) if pd.notna(dd_r.get("points")) else 0
+    dd_status = str(dd_r.get("status", "Finished"))
+    dd_team_color = _normalize_team_color(dd_r.get("team_color"))
 
-        # Best lap
-        dd_drv_laps = lap_times_df[
-            (lap_times_df["driver_id"] == dd_primary_id)
-            & lap_times_df["lap_time_ms"].notna()
-            & (lap_times_df["lap_time_ms"] > 0)
-            & (lap_times_df["lap_number"] > 1)
-            & ~lap_times_df["is_pit_in_lap"].fillna(False)
-            & ~lap_times_df["is_pit_out_lap"].fillna(False)
-        ]
-        dd_best_lap = (
-            format_lap_time_ms(dd_drv_laps["lap_time_ms"].min()) if not dd_drv_laps.empty else "-"
-        )
+    # Best lap + pit stops — precomputed for the whole field once per race
+    field_summary = _driver_summary(race_id, ingested_at, bundle_version, lap_times_df, pit_df)
+    dd_summary = field_summary.get(dd_primary_id, {})
+    dd_best_ms = dd_summary.get("best_lap_ms", np.nan)
+    dd_best_lap = format_lap_time_ms(dd_best_ms) if pd.notna(dd_best_ms) else "-"
+    dd_pit_count = int(dd_summary.get("pit_count", 0))
 
-        # Gap to winner
-        dd_gap_raw = dd_r.get("gap_to_winner_ms")
-        if pd.notna(dd_gap_raw) and float(dd_gap_raw) > 0:
-            dd_gap_str = f"+{float(dd_gap_raw) / 1000.0:.3f}s"
-        elif dd_finish == 1:
-            dd_gap_str = "Winner"
-        else:
-            dd_gap_str = "-"
-
-        # Pit stops
-        dd_pits = pit_df[pit_df["driver_id"] == dd_primary_id]
-        dd_pit_count = len(dd_pits)
+    # Gap to winner
+    dd_gap_raw = dd_r.get("gap_to_winner_ms")
+    if pd.notna(dd_gap_raw) and float(dd_gap_raw) > 0:
+        dd_gap_str = f"+{float(dd_gap_raw) / 1000.0:.3f}s"
+    elif dd_finish == 1:
+        dd_gap_str = "Winner"
+    else:
+        dd_gap_str = "-"
 
-        # Positions gained/lost
-        if isinstance(dd_grid, int) and isinstance(dd_finish, int):
-            dd_pos_delta = dd_grid - dd_finish
-            if dd_pos_delta > 0:
-                dd_pos_delta_str = f"+{dd_pos_delta}"
-                dd_pos_variant = "movement"
-            elif dd_pos_delta < 0:
-                dd_pos_delta_str = str(dd_pos_delta)
-                dd_pos_variant = "incident"
-            else:
-                dd_pos_delta_str = "0"
-                dd_pos_variant = "count"
+    # Positions gained/lost
+    if isinstance(dd_grid, int) and isinstance(dd_finish, int):
+        dd_pos_delta = dd_grid - dd_finish
+        if dd_pos_delta > 0:
+            dd_pos_delta_str = f"+{dd_pos_delta}"
+            dd_pos_variant = "movement"
+        elif dd_pos_delta < 0:
+            dd_pos_delta_str = str(dd_pos_delta)
+            dd_pos_variant = "incident"
         else:
-            dd_pos_delta_str = "-"
+            dd_pos_delta_str = "0"
             dd_pos_variant = "count"
+    else:
+        dd_pos_delta_str = "-"
+        dd_pos_variant = "count"
 
-        sc1, sc2, sc3, sc4 = st.columns(4)
-        with sc1:
-            st.markdown(
-                metric_html(
-                    "Grid",
-                    f"P{dd_grid}" if isinstance(dd_grid, int) else dd_grid,
-                    icon="ph-bold ph-flag-banner",
-                    variant="count",
-                ),
-                unsafe_allow_html=True,
-            )
-        with sc2:
-            st.markdown(
-                metric_html(
-                    "Finish",
-                    (f"P{dd_finish}" if isinstance(dd_finish, int) else dd_finish),
-                    icon="ph-bold ph-flag-checkered",
-                    variant="timing",
-                ),
-                unsafe_allow_html=True,
-            )
-        with sc3:
-            st.markdown(
-                metric_html(
-                    "Pos. Gained",
-                    dd_pos_delta_str,
-                    icon="ph-bold ph-trend-up",
-                    variant=dd_pos_variant,
-                ),
-                unsafe_allow_html=True,
-            )
-        with sc4:
-            st.markdown(
-                metric_html(
-                    "Points",
-                    str(dd_pts),
-                    icon="ph-bold ph-star",
-                    variant="count",
-                ),
-                unsafe_allow_html=True,
-            )
-
-        st.markdown("<div style='height:0.5rem;'></div>", unsafe_allow_html=True)
-
-        sc5, sc6, sc7, sc8 = st.columns(4)
-        with sc5:
-            st.markdown(
-                metric_html(
-                    "Best Lap",
-                    dd_best_lap,
-                    icon="ph-bold ph-timer",
-                    variant="timing",
-                ),
-                unsafe_allow_html=True,
-            )
-        with sc6:
-            st.markdown(
-                metric_html(
-                    "Gap to P1",
-                    dd_gap_str,
-                    icon="ph-bold ph-arrow-line-right",
-                    variant="timing",
-                ),
-                unsafe_allow_html=True,
-            )
-        with sc7:
-            st.markdown(
-                metric_html(
-                    "Pit Stops",
-                    str(dd_pit_count),
-                    icon="ph-bold ph-wrench",
-                    variant="count",
-                ),
-                unsafe_allow_html=True,
-            )
-        with sc8:
-            st.markdown(
-                metric_html(
-                    "Status",
-                    dd_status,
-                    icon="ph-bold ph-engine",
-                    variant="weather",
-                ),
-                unsafe_allow_html=True,
-            )
+    # One markdown call for all eight cards — same 4×2 grid as the race summary
+    dd_cards = [
+        metric_html(
+            "Grid",
+            f"P{dd_grid}" if isinstance(dd_grid, int) else dd_grid,
+            icon="ph-bold ph-flag-banner",
+            variant="count",
+        ),
+        metric_html(
+            "Finish",
+            (f"P{dd_finish}" if isinstance(dd_finish, int) else dd_finish),
+            icon="ph-bold ph-flag-checkered",
+            variant="timing",
+        ),
+        metric_html(
+            "Pos. Gained",
+            dd_pos_delta_str,
+            icon="ph-bold ph-trend-up",
+            variant=dd_pos_variant,
+        ),
+        metric_html(
+            "Points",
+            str(dd_pts),
+            icon="ph-bold ph-star",
+            variant="count",
+        ),
+        metric_html(
+            "Best Lap",
+            dd_best_lap,
+            icon="ph-bold ph-timer",
+            variant="timing",
+        ),
+        metric_html(
+            "Gap to P1",
+            dd_gap_str,
+            icon="ph-bold ph-arrow-line-right",
+            variant="timing",
+        ),
+        metric_html(
+            "Pit Stops",
+            str(dd_pit_count),
+            icon="ph-bold ph-wrench",
+            variant="count",
+        ),
+        metric_html(
+            "Status",
+            dd_status,
+            icon="ph-bold ph-engine",
+            variant="weather",
+        ),
+    ]
+    st.markdown(
+        f'<div class="summary-kpis">{"".join(dd_cards)}</div>',
+        unsafe_allow_html=True,
+    )
 
     # --- Comparison section (shown first when active) ---
     cmp_team_color = "#F97316"
     if dd_compare_id:
-        cmp_row = results_df[results_df["driver_id"] == dd_compare_id]
-        cmp_color_raw = (
-            cmp_row.iloc[0]["team_color"]
-            if not cmp_row.empty and pd.notna(cmp_row.iloc[0].get("team_color"))
-            else None
-        )
+        cmp_color_raw = dd_cmp_r.get("team_color") if dd_cmp_r else None
         cmp_team_color = _normalize_team_color(cmp_color_raw)
 
         # Styled gradient banner
@@ -236,16 +275,14 @@ def render(
         dd_cmp_code = dd_cmp_name
 
         st.markdown(
-            f"""
-            <div style="background: linear-gradient(90deg, {pri_rgba}, {cmp_rgba});
-                        border-radius: 10px; padding: 0.7rem 1.2rem;
-                        margin: 1rem 0 0.5rem 0; display: flex;
-                        justify-content: space-between; align-items: center;">
-                <span style="font-weight:700;color:{dd_team_color};">{dd_pri_code}</span>
-                <span style="color:#9CA3AF; font-size:0.85rem;">vs</span>
-                <span style="font-weight:700;color:{cmp_team_color};">{dd_cmp_code}</span>
-            </div>
-            """,
+            _VS_BANNER_TEMPLATE.format(
+                pri_rgba=pri_rgba,
+                cmp_rgba=cmp_rgba,
+                pri_color=dd_team_color,
+                cmp_color=cmp_team_color,
+                pri_name=dd_pri_code,
+                cmp_name=dd_cmp_code,
+            ),
             unsafe_allow_html=True,
         )
 
@@ -263,30 +300,31 @@ def render(
                 "shaded zones show SC/VSC periods.</p>",
                 unsafe_allow_html=True,
             )
-            fig_delta = build_lap_delta_chart(
-                lap_times_df=lap_times_df,
-                race_control_df=race_control_df,
-                driver_a_id=dd_primary_id,
-                driver_b_id=dd_compare_id,
-                labels=(dd_pri_code, dd_cmp_code),
-                colors=(dd_team_color, cmp_team_color),
+            fig_delta = _lap_delta_fig(
+                race_id,
+                ingested_at,
+                bundle_version,
+                dd_primary_id,
+                dd_compare_id,
+                (dd_pri_code, dd_cmp_code),
+                (dd_team_color, cmp_team_color),
+                lap_times_df,
+                race_control_df,
             )
             st.plotly_chart(fig_delta, use_container_width=True)
 
         with h2h_right:
-            st.markdown(
-                '<p class="chart-caption">'
-                "Median sector times head-to-head. Shows where each "
-                "driver gained or lost time on the track.</p>",
-                unsafe_allow_html=True,
-            )
-            fig_sec_cmp = build_sector_comparison_chart(
-                lap_times_df=lap_times_df,
-                race_control_df=race_control_df,
-                driver_a_id=dd_primary_id,
-                driver_b_id=dd_compare_id,
-                labels=(dd_pri_code, dd_cmp_code),
-                colors=(dd_team_color, cmp_team_color),
+            chart_caption("h2h_sectors")
+            fig_sec_cmp = _sector_comparison_fig(
+                race_id,
+                ingested_at,
+                bundle_version,
+                dd_primary_id,
+                dd_compare_id,
+                (dd_pri_code, dd_cmp_code),
+                (dd_team_color, cmp_team_color),
+                lap_times_df,
+                race_control_df,
             )
             st.plotly_chart(fig_sec_cmp, use_container_width=True)
 
@@ -306,20 +344,14 @@ def render(
             unsafe_allow_html=True,
         )
     else:
-        st.markdown(
-            '<p class="chart-caption">'
-            "Lap-by-lap pace colored by tyre compound. "
-            "Dashed orange lines mark pit stops. "
-            "Look for how pace changes after each stop and "
-            "during safety car periods.</p>",
-            unsafe_allow_html=True,
-        )
+        chart_caption("narrative")
     fig_narrative = build_driver_narrative_chart(
         lap_times_df=lap_times_df,
         pit_markers_df=pit_df,
         race_control_df=race_control_df,
         driver_id=dd_primary_id,
         compare_driver_id=dd_compare_id,
+        laps_by_driver=laps_by_driver,
     )
     st.plotly_chart(fig_narrative, use_container_width=True)
 
@@ -340,24 +372,16 @@ def render(
             unsafe_allow_html=True,
         )
     else:
-        st.markdown(
-            '<p class="chart-caption">'
-            "Time gap to the race leader throughout the race. "
-            "The line sits at zero when this driver IS the leader. "
-            "When behind, it rises to show how many seconds back "
-            "they are. Spikes typically correspond to pit stop "
-            "windows.</p>",
-            unsafe_allow_html=True,
-        )
+        chart_caption("gap_to_leader")
 
-    dd_team_color_safe = dd_team_color if not dd_row.empty else "#60A5FA"
     fig_gap_leader = build_gap_to_leader_chart(
         lap_times_df=lap_times_df,
         race_control_df=race_control_df,
         driver_id=dd_primary_id,
-        team_color=dd_team_color_safe,
+        team_color=dd_team_color,
         compare_driver_id=dd_compare_id,
         compare_team_color=(cmp_team_color if dd_compare_id else "#F97316"),
+        laps_by_driver=laps_by_driver,
     )
     st.plotly_chart(fig_gap_leader, use_container_width=True)
 
@@ -366,17 +390,11 @@ def render(
         '<p class="section-header">Sector Breakdown (per lap)</p>',
         unsafe_allow_html=True,
     )
-    st.markdown(
-        '<p class="chart-caption">'
-        "Each cell shows a sector time for a specific lap. "
-        "Green = close to personal best, red = further away. "
-        "Pit laps are excluded (distorted times). "
-        "SC/VSC and pit-adjacent laps are labelled.</p>",
-        unsafe_allow_html=True,
-    )
+    chart_caption("driver_sectors")
     fig_drv_sectors = build_driver_sector_heatmap(
         lap_times_df=lap_times_df,
         driver_id=dd_primary_id,
         race_control_df=race_control_df,
+        laps_by_driver=laps_by_driver,
     )
     st.plotly_chart(fig_drv_sectors, use_container_width=True)
@@ -2,30 +2,112 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from charts import build_grid_finish_chart
+from components import chart_caption
+
+# One classification row; positional fields are Pos, Driver, Team, Grid, Status, Points
+_ROW_TEMPLATE = (
+    '<tr style="border-bottom: 1px solid rgba(255,255,255,0.05);">'
+    '<td style="padding: 10px 16px; color: #FFFFFF; font-weight: 700;">{0}</td>'
+    '<td style="padding: 10px 16px; color: #E5E7EB;">{1}</td>'
+    '<td style="padding: 10px 16px; color: #E5E7EB;">{2}</td>'
+    '<td style="padding: 10px 16px; color: #E5E7EB;">{3}</td>'
+    '<td style="padding: 10px 16px; {gained_style}">{gained_str}</td>'
+    '<td style="padding: 10px 16px; color: #E5E7EB;">{4}</td>'
+    '<td style="padding: 10px 16px; color: #E5E7EB;">{5}</td>'
+    "</tr>"
+)
+
+
+@st.cache_data(show_spinner=False)
+def _race_classification(
+    race_id: str, ingested_at: str, v: int, _results_df: pd.DataFrame
+) -> tuple[str, pd.DataFrame]:
+    """Render the classification table HTML (and its display frame) once per race.
+
+    Both are pure functions of the race's results, so reruns from widget
+    changes elsewhere on the page reuse the cached values.
+    """
+    # Positions arrive as nullable Int8 from the bundle, so only fill, no cast
+    grid = _results_df["grid_position"].fillna(0)
+    finish = _results_df["finish_position"].fillna(0)
+    show_df = pd.DataFrame(
+        {
+            "Pos": finish,
+            "Driver": _results_df["full_name"].fillna(_results_df["driver_code"]),
+            "Team": _results_df["team_name"].fillna("-"),
+            "Grid": grid,
+            "Gained/Lost": grid - finish,
+            "Status": _results_df["status"].fillna("Finished"),
+            "Points": _results_df["points"].fillna(0).astype(int),
+        }
+    )
+
+    # Gained/Lost cell style + text, chosen per column rather than per row
+    gained = show_df["Gained/Lost"].to_numpy()
+    gained_styles = np.select(
+        [gained > 0, gained < 0],
+        ["color: #22C55E; font-weight: 700;", "color: #EF4444; font-weight: 700;"],
+        default="color: #9CA3AF;",
+    )
+    gained_strs = np.where(gained > 0, "+", "") + gained.astype(str)
+
+    # Build custom HTML table with inline dark theme styles
+    rows_html = "".join(
+        _ROW_TEMPLATE.format(*cells, gained_style=style, gained_str=text)
+        for cells, style, text in zip(
+            show_df[["Pos", "Driver", "Team", "Grid", "Status", "Points"]].itertuples(
+                index=False, name=None
+            ),
+            gained_styles,
+            gained_strs,
+            strict=True,
+        )
+    )
+
+    _ths = "padding:12px 16px;text-align:left;color:#9CA3AF;font-weight:600"
+    table_html = (
+        '<div style="background: #1A1D26; border-radius: 8px; overflow: hidden;">'
+        '<table style="width: 100%; border-collapse: collapse; font-size: 0.9rem;">'
+        "<thead>"
+        f'<tr style="background: #252A3A;">'
+        f'<th style="{_ths}">Pos</th>'
+        f'<th style="{_ths}">Driver</th>'
+        f'<th style="{_ths}">Team</th>'
+        f'<th style="{_ths}">Grid</th>'
+        f'<th style="{_ths}">Gained/Lost</th>'
+        f'<th style="{_ths}">Status</th>'
+        f'<th style="{_ths}">Points</th>'
+        "</tr>"
+        "</thead>"
+        f'<tbody style="background: #1A1D26;">{rows_html}</tbody>'
+        "</table></div>"
+    )
+
+    return table_html, show_df
+
+
+@st.cache_data(show_spinner=False)
+def _results_csv(race_id: str, ingested_at: str, v: int, _show_df: pd.DataFrame) -> bytes:
+    """CSV export of the classification, encoded at most once per race."""
+    return _show_df.to_csv(index=False).encode("utf-8")
 
 
 @st.fragment
 def render(
     results_df: pd.DataFrame,
     race_id: str,
+    ingested_at: str,
+    bundle_version: int,
 ) -> None:
     st.markdown(
         '<p class="section-header first">Grid vs Finish</p>',
         unsafe_allow_html=True,
     )
-    st.markdown(
-        '<p class="chart-caption">'
-        "Where each driver started (open circle) versus where they "
-        "finished (filled circle). "
-        '<span style="color:#22C55E;font-weight:700;">Green</span> = '
-        "gained positions, "
-        '<span style="color:#EF4444;font-weight:700;">Red</span> = '
-        "lost positions.</p>",
-        unsafe_allow_html=True,
-    )
+    chart_caption("grid_finish")
     fig_gf = build_grid_finish_chart(results_df)
     st.plotly_chart(fig_gf, use_container_width=True)
 
@@ -33,93 +115,16 @@ def render(
         '<p class="section-header">Race Classification</p>',
         unsafe_allow_html=True,
     )
-    st.markdown(
-        '<p class="chart-caption">'
-        "Final standings with positions gained or lost from the starting "
-        "grid to the finish.</p>",
-        unsafe_allow_html=True,
-    )
+    chart_caption("classification")
 
     if not results_df.empty:
-        display_df = results_df.copy()
-        display_df["Grid"] = display_df["grid_position"].fillna(0).astype(int)
-        display_df["Finish"] = display_df["finish_position"].fillna(0).astype(int)
-        display_df["Gained/Lost"] = display_df["Grid"] - display_df["Finish"]
-        display_df["Driver"] = display_df.apply(
-            lambda row: (row["full_name"] if pd.notna(row["full_name"]) else row["driver_code"]),
-            axis=1,
-        )
-        display_df["Team"] = display_df["team_name"].fillna("-")
-        display_df["Status"] = display_df["status"].fillna("Finished")
-        display_df["Points"] = display_df["points"].fillna(0).astype(int)
-
-        show_df = display_df[
-            [
-                "Finish",
-                "Driver",
-                "Team",
-                "Grid",
-                "Gained/Lost",
-                "Status",
-                "Points",
-            ]
-        ].copy()
-        show_df = show_df.rename(columns={"Finish": "Pos"})
-        show_df = show_df.reset_index(drop=True)
-
-        # Build custom HTML table with inline dark theme styles
-        rows_html = ""
-        for _, row in show_df.iterrows():
-            gained = row["Gained/Lost"]
-            if gained > 0:
-                gained_style = "color: #22C55E; font-weight: 700;"
-                gained_str = f"+{gained}"
-            elif gained < 0:
-                gained_style = "color: #EF4444; font-weight: 700;"
-                gained_str = str(gained)
-            else:
-                gained_style = "color: #9CA3AF;"
-                gained_str = "0"
-
-            rows_html += (
-                '<tr style="border-bottom: 1px solid rgba(255,255,255,0.05);">'
-                '<td style="padding: 10px 16px; color: #FFFFFF; '
-                f'font-weight: 700;">{row["Pos"]}</td>'
-                f'<td style="padding: 10px 16px; color: #E5E7EB;">{row["Driver"]}</td>'
-                f'<td style="padding: 10px 16px; color: #E5E7EB;">{row["Team"]}</td>'
-                f'<td style="padding: 10px 16px; color: #E5E7EB;">{row["Grid"]}</td>'
-                f'<td style="padding: 10px 16px; {gained_style}">{gained_str}</td>'
-                f'<td style="padding: 10px 16px; color: #E5E7EB;">{row["Status"]}</td>'
-                f'<td style="padding: 10px 16px; color: #E5E7EB;">{row["Points"]}</td>'
-                "</tr>"
-            )
-
-        _ths = "padding:12px 16px;text-align:left;color:#9CA3AF;font-weight:600"
-        table_html = (
-            '<div style="background: #1A1D26; border-radius: 8px; overflow: hidden;">'
-            '<table style="width: 100%; border-collapse: collapse; font-size: 0.9rem;">'
-            "<thead>"
-            f'<tr style="background: #252A3A;">'
-            f'<th style="{_ths}">Pos</th>'
-            f'<th style="{_ths}">Driver</th>'
-            f'<th style="{_ths}">Team</th>'
-            f'<th style="{_ths}">Grid</th>'
-            f'<th style="{_ths}">Gained/Lost</th>'
-            f'<th style="{_ths}">Status</th>'
-            f'<th style="{_ths}">Points</th>'
-            "</tr>"
-            "</thead>"
-            f'<tbody style="background: #1A1D26;">{rows_html}</tbody>'
-            "</table></div>"
-        )
-
+        table_html, show_df = _race_classification(race_id, ingested_at, bundle_version, results_df)
         st.markdown(table_html, unsafe_allow_html=True)
 
-        # CSV download
-        csv_data = show_df.to_csv(index=False).encode("utf-8")
+        # CSV download — encoded only when the button is clicked
         st.download_button(
             "Download results as CSV",
-            csv_data,
+            lambda: _results_csv(race_id, ingested_at, bundle_version, show_df),
             file_name=f"race_results_{race_id}.csv",
             mime="text/csv",
         )
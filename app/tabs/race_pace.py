@@ -3,13 +3,77 @@
 from __future__ import annotations
 
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 from charts import (
     build_lap_distribution_chart,
     build_race_pace_chart,
     build_sector_heatmap,
 )
-from components import driver_selector
+from components import chart_caption, driver_selector
+
+
+# Figures are keyed on the bundle key (race, ingest time, bundle version) +
+# selector state (frames are unhashed), so toggling the driver filter back to
+# a recent choice skips the rebuild and a re-ingest rebuilds from new data.
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _pace_fig(
+    race_id: str,
+    ingested_at: str,
+    v: int,
+    top_n: int,
+    driver_ids: tuple[str, ...] | None,
+    show_sc_vsc: bool,
+    _lap_times_df: pd.DataFrame,
+    _results_df: pd.DataFrame,
+    _race_control_df: pd.DataFrame,
+) -> go.Figure:
+    return build_race_pace_chart(
+        lap_times_df=_lap_times_df,
+        results_df=_results_df,
+        race_control_df=_race_control_df,
+        highlight_top_n=top_n,
+        highlight_driver_ids=set(driver_ids) if driver_ids is not None else None,
+        show_sc_vsc=show_sc_vsc,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _distribution_fig(
+    race_id: str,
+    ingested_at: str,
+    v: int,
+    top_n: int,
+    driver_ids: tuple[str, ...] | None,
+    _lap_times_df: pd.DataFrame,
+    _results_df: pd.DataFrame,
+    _race_control_df: pd.DataFrame,
+    _laps_by_driver: dict[str, pd.DataFrame] | None = None,
+) -> go.Figure:
+    return build_lap_distribution_chart(
+        lap_times_df=_lap_times_df,
+        results_df=_results_df,
+        race_control_df=_race_control_df,
+        highlight_top_n=top_n,
+        highlight_driver_ids=set(driver_ids) if driver_ids is not None else None,
+        laps_by_driver=_laps_by_driver,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _sector_fig(
+    race_id: str,
+    ingested_at: str,
+    v: int,
+    _lap_times_df: pd.DataFrame,
+    _results_df: pd.DataFrame,
+    _race_control_df: pd.DataFrame,
+) -> go.Figure:
+    return build_sector_heatmap(
+        lap_times_df=_lap_times_df,
+        results_df=_results_df,
+        race_control_df=_race_control_df,
+    )
 
 
 @st.fragment
@@ -21,6 +85,10 @@ def render(
     all_driver_names: list[str],
     driver_name_to_id: dict[str, str],
     show_sc_vsc: bool,
+    race_id: str,
+    ingested_at: str,
+    bundle_version: int,
+    laps_by_driver: dict[str, pd.DataFrame] | None = None,
 ) -> None:
     st.markdown(
         '<p class="section-header first">Lap-by-Lap Pace</p>',
@@ -28,15 +96,7 @@ def render(
     )
     pace_cap_col, pace_ctrl_col = st.columns([5, 1.5])
     with pace_cap_col:
-        st.markdown(
-            '<p class="chart-caption">'
-            "Each line shows a driver's smoothed pace across the race. "
-            "Lower means faster. "
-            "Faded dots are individual lap times. "
-            "Pit stops, safety car laps, and the opening lap are removed "
-            "to show true racing speed.</p>",
-            unsafe_allow_html=True,
-        )
+        chart_caption("pace")
     with pace_ctrl_col:
         pace_top_n, pace_ids = driver_selector(
             "pace",
@@ -44,13 +104,17 @@ def render(
             driver_name_to_id,
             default_mode="Top 5",
         )
-    fig_pace = build_race_pace_chart(
-        lap_times_df=lap_times_df,
-        results_df=results_df,
-        race_control_df=race_control_df,
-        highlight_top_n=pace_top_n,
-        highlight_driver_ids=pace_ids,
-        show_sc_vsc=show_sc_vsc,
+    pace_key = tuple(sorted(pace_ids)) if pace_ids is not None else None
+    fig_pace = _pace_fig(
+        race_id,
+        ingested_at,
+        bundle_version,
+        pace_top_n,
+        pace_key,
+        show_sc_vsc,
+        lap_times_df,
+        results_df,
+        race_control_df,
     )
     st.plotly_chart(fig_pace, use_container_width=True)
 
@@ -59,21 +123,17 @@ def render(
         '<p class="section-header">Lap Time Consistency</p>',
         unsafe_allow_html=True,
     )
-    st.markdown(
-        '<p class="chart-caption">'
-        "How consistent was each driver's pace? "
-        "The box shows the typical range of lap times. "
-        "a narrow box means very steady driving. "
-        "The vertical line inside each box is the median "
-        "(typical) lap time. Further left = faster.</p>",
-        unsafe_allow_html=True,
-    )
-    fig_box = build_lap_distribution_chart(
-        lap_times_df=lap_times_df,
-        results_df=results_df,
-        race_control_df=race_control_df,
-        highlight_top_n=pace_top_n,
-        highlight_driver_ids=pace_ids,
+    chart_caption("consistency")
+    fig_box = _distribution_fig(
+        race_id,
+        ingested_at,
+        bundle_version,
+        pace_top_n,
+        pace_key,
+        lap_times_df,
+        results_df,
+        race_control_df,
+        laps_by_driver,
     )
     st.plotly_chart(fig_box, use_container_width=True)
 
@@ -82,18 +142,8 @@ def render(
         '<p class="section-header">Sector Performance</p>',
         unsafe_allow_html=True,
     )
-    st.markdown(
-        '<p class="chart-caption">'
-        "Every lap is split into 3 sectors. "
-        "This heatmap shows each driver's typical time in each sector. "
-        "Green = closest to the fastest time in that sector, "
-        "red = furthest behind. "
-        "Helps you see which part of the track each driver excels at.</p>",
-        unsafe_allow_html=True,
-    )
-    fig_sectors = build_sector_heatmap(
-        lap_times_df=lap_times_df,
-        results_df=results_df,
-        race_control_df=race_control_df,
+    chart_caption("sectors")
+    fig_sectors = _sector_fig(
+        race_id, ingested_at, bundle_version, lap_times_df, results_df, race_control_df
     )
     st.plotly_chart(fig_sectors, use_container_width=True)
@@ -3,9 +3,43 @@
 from __future__ import annotations
 
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 from charts import build_gap_timeline_chart, build_position_chart
-from components import driver_selector
+from components import chart_caption, driver_selector
+
+
+# Keyed on the race + selector state; the bundle itself is not hashed
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _position_fig(
+    race_id: str,
+    ingested_at: str,
+    v: int,
+    top_n: int,
+    driver_ids: tuple[str, ...] | None,
+    show_sc_vsc: bool,
+    _bundle: dict[str, pd.DataFrame],
+) -> go.Figure:
+    return build_position_chart(
+        positions_df=_bundle["positions"],
+        results_df=_bundle["results"],
+        highlight_top_n=top_n,
+        highlight_driver_ids=set(driver_ids) if driver_ids is not None else None,
+        race_control_df=_bundle["race_control"],
+        show_sc_vsc=show_sc_vsc,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _gap_fig(
+    race_id: str, ingested_at: str, v: int, show_sc_vsc: bool, _bundle: dict[str, pd.DataFrame]
+) -> go.Figure:
+    return build_gap_timeline_chart(
+        gap_df=_bundle["gap"],
+        race_control_df=_bundle["race_control"],
+        pit_markers_df=_bundle["pit_markers"],
+        show_sc_vsc=show_sc_vsc,
+    )
 
 
 @st.fragment
@@ -14,6 +48,9 @@ def render(
     all_driver_names: list[str],
     driver_name_to_id: dict[str, str],
     show_sc_vsc: bool,
+    race_id: str,
+    ingested_at: str,
+    bundle_version: int,
 ) -> None:
     st.markdown(
         '<p class="section-header first">Position Chart</p>',
@@ -21,25 +58,14 @@ def render(
     )
     pos_cap_col, pos_ctrl_col = st.columns([5, 1.5])
     with pos_cap_col:
-        st.markdown(
-            '<p class="chart-caption">'
-            "Where each driver ran throughout the race. "
-            "P1 (the leader) is at the top. "
-            "Watch for lines crossing each other "
-            "to spot overtakes.</p>",
-            unsafe_allow_html=True,
-        )
+        chart_caption("position")
     with pos_ctrl_col:
         pos_top_n, pos_ids = driver_selector(
             "pos", all_driver_names, driver_name_to_id, default_mode="Top 10"
         )
-    fig_pos = build_position_chart(
-        positions_df=bundle["positions"],
-        results_df=bundle["results"],
-        highlight_top_n=pos_top_n,
-        highlight_driver_ids=pos_ids,
-        race_control_df=bundle["race_control"],
-        show_sc_vsc=show_sc_vsc,
+    pos_key = tuple(sorted(pos_ids)) if pos_ids is not None else None
+    fig_pos = _position_fig(
+        race_id, ingested_at, bundle_version, pos_top_n, pos_key, show_sc_vsc, bundle
     )
     st.plotly_chart(fig_pos, use_container_width=True)
 
@@ -49,18 +75,6 @@ def render(
     )
     cap_col, _ctrl_col = st.columns([4, 1])
     with cap_col:
-        st.markdown(
-            '<p class="chart-caption">'
-            "The time gap between the race leader and the driver in second. "
-            "When the line rises, the leader is pulling away. "
-            "When it drops, P2 is closing in, "
-            "signalling an exciting battle for the lead.</p>",
-            unsafe_allow_html=True,
-        )
-    fig_gap = build_gap_timeline_chart(
-        gap_df=bundle["gap"],
-        race_control_df=bundle["race_control"],
-        pit_markers_df=bundle["pit_markers"],
-        show_sc_vsc=show_sc_vsc,
-    )
+        chart_caption("leader_gap")
+    fig_gap = _gap_fig(race_id, ingested_at, bundle_version, show_sc_vsc, bundle)
     st.plotly_chart(fig_gap, use_container_width=True)
@@ -3,8 +3,36 @@
 from __future__ import annotations
 
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 from charts import build_pit_duration_chart, build_stint_chart, build_tyre_degradation_chart
+from components import chart_caption
+
+
+# Every figure on this tab depends only on the race, so each is built once
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _strategy_figs(
+    race_id: str,
+    ingested_at: str,
+    v: int,
+    _stints_df: pd.DataFrame,
+    _pit_dur_df: pd.DataFrame,
+    _results_df: pd.DataFrame,
+    _lap_times_df: pd.DataFrame,
+    _race_control_df: pd.DataFrame,
+) -> tuple[go.Figure, go.Figure | None, go.Figure]:
+    fig_stint = build_stint_chart(_stints_df, results_df=_results_df)
+    fig_pit = (
+        build_pit_duration_chart(_pit_dur_df, results_df=_results_df)
+        if not _pit_dur_df.empty
+        else None
+    )
+    fig_deg = build_tyre_degradation_chart(
+        lap_times_df=_lap_times_df,
+        results_df=_results_df,
+        race_control_df=_race_control_df,
+    )
+    return fig_stint, fig_pit, fig_deg
 
 
 @st.fragment
@@ -13,51 +41,35 @@ def render(
     results_df: pd.DataFrame,
     lap_times_df: pd.DataFrame,
     race_control_df: pd.DataFrame,
+    race_id: str,
+    ingested_at: str,
+    bundle_version: int,
 ) -> None:
-    st.markdown(
-        '<p class="section-header first">Tyre Strategy</p>',
-        unsafe_allow_html=True,
+    fig_stint, fig_pit, fig_deg = _strategy_figs(
+        race_id,
+        ingested_at,
+        bundle_version,
+        bundle["stints"],
+        bundle.get("pit_durations", pd.DataFrame()),
+        results_df,
+        lap_times_df,
+        race_control_df,
     )
+
     st.markdown(
-        '<p class="chart-caption">'
-        "Each bar is a stint (the period between pit stops). "
-        "Teams choose from three dry slick compounds: "
-        '<span style="color:#FF3333;font-weight:700;">Soft</span> '
-        "(fastest, wears out quickly), "
-        '<span style="color:#FFC300;font-weight:700;">Medium</span> '
-        "(balanced), and "
-        '<span style="color:#F0F0F0;font-weight:700;">Hard</span> '
-        "(slowest but lasts longest). "
-        "In wet conditions, teams switch to "
-        '<span style="color:#39D353;font-weight:700;">Intermediate</span> '
-        "(light rain or a drying track) or "
-        '<span style="color:#4A90D9;font-weight:700;">Wet</span> '
-        "(heavy rain with standing water). "
-        '<span style="color:#94A3B8;font-weight:700;">Gray</span> '
-        "bars indicate laps where tyre data was unavailable. "
-        "Diamond markers show pit stops. "
-        "Drivers sorted by finishing position (winner at top).</p>",
+        '<p class="section-header first">Tyre Strategy</p>',
         unsafe_allow_html=True,
     )
-    fig_stint = build_stint_chart(bundle["stints"], results_df=results_df)
+    chart_caption("stints")
     st.plotly_chart(fig_stint, use_container_width=True)
 
     # -- Pit Stop Duration --
-    pit_dur_df = bundle.get("pit_durations", pd.DataFrame())
-    if not pit_dur_df.empty:
+    if fig_pit is not None:
         st.markdown(
             '<p class="section-header">Pit Stop Duration</p>',
             unsafe_allow_html=True,
         )
-        st.markdown(
-            '<p class="chart-caption">'
-            "Time spent in the pit lane for each stop. "
-            "Shorter bars mean a faster pit crew or a cleaner stop. "
-            "A slow pit stop can cost a driver positions and "
-            "even decide the outcome of a race.</p>",
-            unsafe_allow_html=True,
-        )
-        fig_pit = build_pit_duration_chart(pit_dur_df, results_df=results_df)
+        chart_caption("pit_duration")
         st.plotly_chart(fig_pit, use_container_width=True)
 
     # -- Tyre Degradation --
@@ -65,17 +77,5 @@ def render(
         '<p class="section-header">Tyre Degradation</p>',
         unsafe_allow_html=True,
     )
-    st.markdown(
-        '<p class="chart-caption">'
-        "As tyres wear out, lap times get slower. "
-        "This chart shows how quickly each compound loses performance. "
-        "Steeper upward trends mean faster degradation. "
-        "Teams use this data to decide when to pit.</p>",
-        unsafe_allow_html=True,
-    )
-    fig_deg = build_tyre_degradation_chart(
-        lap_times_df=lap_times_df,
-        results_df=results_df,
-        race_control_df=race_control_df,
-    )
+    chart_caption("tyre_degradation")
     st.plotly_chart(fig_deg, use_container_width=True)
@@ -1,36 +1,122 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+import atexit
+from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 import pandas as pd
 import psycopg
+from psycopg.pq import TransactionStatus
 
 from pipeline.config import get_settings
 
+# A few idle connections per autocommit mode are kept for the life of the
+# process, so the dozen-plus stage queries of an ingest run (and the parallel
+# mart reads) share connect + auth handshakes instead of paying one per call.
+# list.append/pop are atomic under the GIL, so threads can share the stacks.
+_MAX_IDLE_PER_MODE = 4
+_IDLE_CONNS: dict[bool, list[psycopg.Connection]] = {False: [], True: []}
+
+
+def _close_idle_conns() -> None:
+    for idle in _IDLE_CONNS.values():
+        while idle:
+            idle.pop().close()
+
+
+atexit.register(_close_idle_conns)
+
+
+def _take_idle_conn(autocommit: bool) -> psycopg.Connection | None:
+    # A parked connection may since have been dropped by the server or left
+    # in a failed state; those are closed and skipped rather than handed out
+    idle = _IDLE_CONNS[autocommit]
+    while True:
+        try:
+            conn = idle.pop()
+        except IndexError:
+            return None
+        if not conn.closed and conn.info.transaction_status == TransactionStatus.IDLE:
+            return conn
+        conn.close()
+
 
 @contextmanager
 def get_conn(autocommit: bool = False) -> Iterator[psycopg.Connection]:
-    settings = get_settings()
-    conn = psycopg.connect(settings.db_dsn, autocommit=autocommit)
+    conn = _take_idle_conn(autocommit)
+    if conn is None:
+        conn = psycopg.connect(get_settings().db_dsn, autocommit=autocommit)
     try:
         yield conn
-    finally:
+    except BaseException:
         conn.close()
+        raise
 
+    # Uncommitted work is discarded exactly as close() used to; anything not
+    # back to a clean idle state is closed rather than reused
+    status = conn.info.transaction_status
+    if status in (TransactionStatus.INTRANS, TransactionStatus.INERROR):
+        try:
+            conn.rollback()
+        except psycopg.Error:
+            # The server went away mid-transaction; the close() below drops it
+            pass
+        status = conn.info.transaction_status
+    idle = _IDLE_CONNS[autocommit]
+    if conn.closed or status != TransactionStatus.IDLE or len(idle) >= _MAX_IDLE_PER_MODE:
+        conn.close()
+    else:
+        idle.append(conn)
 
-def bootstrap_warehouse() -> None:
+
+# Arbitrary key for pg_advisory_xact_lock: serialises concurrent bootstraps
+# (backfill workers, make targets) so they don't race on the same DDL
+_BOOTSTRAP_LOCK_KEY = 20_240_101
+
+
+@lru_cache(maxsize=1)
+def _init_sql() -> str:
     sql_path = Path(__file__).resolve().parents[1] / "sql" / "init_warehouse.sql"
     if not sql_path.exists():
         raise FileNotFoundError(f"Warehouse SQL not found at {sql_path}")
+    return sql_path.read_text()
 
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql_path.read_text())
-        conn.commit()
+
+def bootstrap_warehouse() -> None:
+    init_sql = _init_sql()
+    with get_conn() as conn, conn.transaction(), conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_BOOTSTRAP_LOCK_KEY,))
+        cur.execute(init_sql)
 
 
 def query_df(sql: str, params: tuple | dict | None = None) -> pd.DataFrame:
-    with get_conn() as conn:
-        return pd.read_sql_query(sql, conn, params=params)
+    # Binary protocol: numbers and timestamps arrive without text parsing, and
+    # pandas' DBAPI fallback path (and its per-call UserWarning) is skipped.
+    # Reads run in autocommit, so no BEGIN/ROLLBACK wraps each query.
+    with get_conn(autocommit=True) as conn, conn.cursor(binary=True) as cur:
+        cur.execute(sql, params)
+        columns = [col.name for col in cur.description]
+        return pd.DataFrame.from_records(cur.fetchall(), columns=columns, coerce_float=True)
+
+
+def query_dfs(
+    queries: Iterable[tuple[str, tuple | dict | None]],
+) -> list[pd.DataFrame]:
+    # Pipeline mode: every statement is sent before any result is awaited, so
+    # N reads share one connection checkout and one network round trip
+    with get_conn(autocommit=True) as conn:
+        with conn.pipeline():
+            cursors = []
+            for sql, params in queries:
+                cur = conn.cursor(binary=True)
+                cur.execute(sql, params)
+                cursors.append(cur)
+        frames = []
+        for cur in cursors:
+            with cur:
+                rows = cur.fetchall()
+                columns = [col.name for col in cur.description]
+                frames.append(pd.DataFrame.from_records(rows, columns=columns, coerce_float=True))
+        return frames
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import logging
+import random
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -15,6 +17,11 @@ from pipeline.utils import datetime_to_utc, make_race_id
 logger = logging.getLogger(__name__)
 
 
+# FastF1 answered, but with no rows: retrying the same request won't help
+class EmptyExtractError(ValueError):
+    pass
+
+
 @dataclass
 class SessionExtract:
     season: int
@@ -31,6 +38,7 @@ class SessionExtract:
     weather: pd.DataFrame
 
 
+@lru_cache(maxsize=1)
 def _enable_cache() -> None:
     settings = get_settings()
     Path(settings.fastf1_cache_dir).mkdir(parents=True, exist_ok=True)
@@ -42,11 +50,17 @@ def _with_retries(label: str, fn, attempts: int = 4, base_sleep_seconds: float =
     for attempt in range(1, attempts + 1):
         try:
             return fn()
+        except EmptyExtractError:
+            # Empty schedule / no laps: the same request gives the same answer.
+            # Other ValueErrors (e.g. FastF1's "Failed to load any schedule
+            # data" during an outage) are transient and still retried.
+            raise
         except Exception as exc:  # noqa: BLE001
             last_exc = exc
             if attempt == attempts:
                 break
-            sleep_for = base_sleep_seconds * (2 ** (attempt - 1))
+            # Jitter keeps concurrent fetchers from retrying in lockstep
+            sleep_for = base_sleep_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
             logger.warning(
                 "%s failed on attempt %s/%s: %s. Retrying in %.1fs",
                 label,
@@ -60,13 +74,17 @@ def _with_retries(label: str, fn, attempts: int = 4, base_sleep_seconds: float =
     raise last_exc
 
 
+# Season backfills refresh the schedule before every round; the schedule does
+# not change within a run, so fetch each (season, session_type) once.
+# Callers must treat the returned frame as read-only.
+@lru_cache(maxsize=16)
 def fetch_event_schedule(season: int, session_type: str = "R") -> pd.DataFrame:
     _enable_cache()
 
     def _load_schedule() -> pd.DataFrame:
         schedule_df = fastf1.get_event_schedule(season, include_testing=False)
         if schedule_df is None or schedule_df.empty:
-            raise ValueError(f"Empty schedule returned for season={season}")
+            raise EmptyExtractError(f"Empty schedule returned for season={season}")
         return schedule_df
 
     schedule = _with_retries(
@@ -76,43 +94,92 @@ def fetch_event_schedule(season: int, session_type: str = "R") -> pd.DataFrame:
         base_sleep_seconds=2.0,
     )
 
-    schedule = schedule.copy()
-    schedule["season"] = season
-    schedule["round"] = schedule["RoundNumber"].astype(int)
-    schedule["event_name"] = schedule["EventName"].astype(str)
-    schedule["circuit"] = schedule.get("Location", pd.Series([None] * len(schedule)))
-    schedule["country"] = schedule.get("Country", pd.Series([None] * len(schedule)))
-    schedule["race_datetime_utc"] = schedule.get(
-        "EventDate", pd.Series([None] * len(schedule))
-    ).apply(datetime_to_utc)
-    schedule["session_type"] = session_type.upper()
-    schedule["race_id"] = schedule.apply(
-        lambda row: make_race_id(int(row["season"]), int(row["round"]), row["session_type"]), axis=1
+    # Build the output frame in one go instead of growing a copy column by column
+    missing = pd.Series(None, index=schedule.index, dtype=object)
+    rounds = schedule["RoundNumber"].astype(int)
+    event_names = schedule["EventName"].astype(str)
+    return pd.DataFrame(
+        {
+            # ~25 rows: a plain listcomp over make_race_id beats a .str concat chain
+            "race_id": [make_race_id(season, rnd, session_type) for rnd in rounds.tolist()],
+            "season": season,
+            "round": rounds,
+            "event_name": event_names,
+            "circuit": schedule.get("Location", missing),
+            "country": schedule.get("Country", missing),
+            "race_datetime_utc": pd.to_datetime(
+                schedule.get("EventDate", missing), utc=True, errors="coerce"
+            ),
+            "fastf1_event_key": (
+                schedule.get("OfficialEventName", missing).fillna(event_names).astype(str)
+            ),
+            "session_type": session_type.upper(),
+        },
+        index=schedule.index,
     )
-    schedule["fastf1_event_key"] = (
-        schedule.get("OfficialEventName", pd.Series([None] * len(schedule)))
-        .fillna(schedule["event_name"])
-        .astype(str)
+
+
+# Bump when SessionExtract's fields or the meaning of its frames change, so
+# pickles written by older code are never loaded
+_EXTRACT_CACHE_VERSION = 1
+
+# FastF1 keeps filling in results and timing for a while after a race, so only
+# sessions at least this old (and with results) are pinned in the cache
+_EXTRACT_CACHE_MIN_AGE = pd.Timedelta(days=7)
+
+
+def _extract_cache_path(race_id: str) -> Path:
+    return Path(get_settings().fastf1_cache_dir) / "extracts" / f"{race_id}.pkl"
+
+
+def _read_cached_extract(path: Path) -> SessionExtract | None:
+    if not path.exists():
+        return None
+    try:
+        version, extracted = pd.read_pickle(path)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Ignoring unreadable extract cache %s: %s", path, exc)
+        return None
+    if version != _EXTRACT_CACHE_VERSION or not isinstance(extracted, SessionExtract):
+        return None
+    return extracted
+
+
+def _is_settled(extracted: SessionExtract) -> bool:
+    if extracted.results.empty or extracted.race_datetime_utc is None:
+        return False
+    return pd.Timestamp.now(tz="UTC") - extracted.race_datetime_utc >= _EXTRACT_CACHE_MIN_AGE
+
+
+def _write_cached_extract(path: Path, extracted: SessionExtract) -> None:
+    # Plain DataFrames only: FastF1's Laps/SessionResults subclasses carry a
+    # back-reference to the whole Session, which would be pickled with them
+    plain = replace(
+        extracted,
+        laps=pd.DataFrame(extracted.laps),
+        results=pd.DataFrame(extracted.results),
+        weather=pd.DataFrame(extracted.weather),
     )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    pd.to_pickle((_EXTRACT_CACHE_VERSION, plain), tmp_path)
+    tmp_path.replace(path)
 
-    return schedule[
-        [
-            "race_id",
-            "season",
-            "round",
-            "event_name",
-            "circuit",
-            "country",
-            "race_datetime_utc",
-            "fastf1_event_key",
-            "session_type",
-        ]
-    ]
-
-
-def fetch_session_data(season: int, round_number: int, session_type: str = "R") -> SessionExtract:
+
+def fetch_session_data(
+    season: int, round_number: int, session_type: str = "R", force: bool = False
+) -> SessionExtract:
     _enable_cache()
 
+    # session.load() re-parses FastF1's raw cache on every call, so the parsed
+    # frames of settled sessions are kept on disk too.  force=True skips the
+    # cached copy and overwrites it with a fresh load.
+    cache_path = _extract_cache_path(make_race_id(season, round_number, session_type))
+    if not force:
+        cached = _read_cached_extract(cache_path)
+        if cached is not None:
+            return cached
+
     def _load_session() -> SessionExtract:
         session = fastf1.get_session(season, round_number, session_type)
         session.load(laps=True, telemetry=False, weather=True, messages=True)
@@ -121,12 +188,13 @@ def fetch_session_data(season: int, round_number: int, session_type: str = "R")
         race_id = make_race_id(season, round_number, session_type)
         race_datetime_utc = datetime_to_utc(getattr(session, "date", None))
 
-        laps = session.laps.copy().reset_index(drop=True)
+        # reset_index already returns a new frame; no defensive copy needed
+        laps = session.laps.reset_index(drop=True)
         if laps.empty:
-            raise ValueError(f"No lap rows returned for {race_id}")
+            raise EmptyExtractError(f"No lap rows returned for {race_id}")
 
-        results = session.results.copy().reset_index(drop=True)
-        weather = session.weather_data.copy().reset_index(drop=True)
+        results = session.results.reset_index(drop=True)
+        weather = session.weather_data.reset_index(drop=True)
 
         return SessionExtract(
             season=season,
@@ -145,9 +213,15 @@ def fetch_session_data(season: int, round_number: int, session_type: str = "R")
             weather=weather,
         )
 
-    return _with_retries(
+    extracted = _with_retries(
         label=f"session fetch season={season} round={round_number} type={session_type}",
         fn=_load_session,
         attempts=4,
         base_sleep_seconds=2.0,
     )
+    if _is_settled(extracted):
+        _write_cached_extract(cache_path, extracted)
+    elif force:
+        # Don't leave an older pinned copy in place of what was just reloaded
+        cache_path.unlink(missing_ok=True)
+    return extracted
@@ -1,24 +1,38 @@
 from __future__ import annotations
 
-import json
 import logging
+import multiprocessing
 import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Any
 
 import pandas as pd
 
-from pipeline.db import bootstrap_warehouse, get_conn, query_df
+from pipeline.db import bootstrap_warehouse, get_conn, query_df, query_dfs
 from pipeline.extract import SessionExtract, fetch_event_schedule, fetch_session_data
 from pipeline.load import replace_mart_table, replace_staging_table, upsert_dataframe
 from pipeline.marts import build_gap_timeline, build_position_chart, build_stint_summary
 from pipeline.quality import run_quality_checks
-from pipeline.transform import StagingBundle, build_curated_bundle, build_staging_bundle
-from pipeline.utils import make_race_id, now_utc
+from pipeline.transform import (
+    StagingBundle,
+    build_curated_bundle,
+    build_staging_bundle,
+    staging_bundle_hash,
+)
+from pipeline.utils import json_dumps, make_race_id, now_utc
 
 logger = logging.getLogger(__name__)
 
 
+def _init_worker_logging() -> None:
+    # Spawned workers start with an unconfigured root logger, which would drop
+    # the per-race info/warning lines.
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(processName)s %(name)s %(message)s"
+    )
+
+
 def _start_run(season: int, round_number: int, session_type: str, code_version: str) -> str:
     run_id = str(uuid.uuid4())
     with get_conn() as conn:
@@ -55,7 +69,7 @@ def _finish_run(run_id: str, status: str, notes: dict[str, Any] | None = None) -
                     notes = %s
                 WHERE run_id = %s
                 """,
-                (now_utc(), status, json.dumps(notes or {}), run_id),
+                (now_utc(), status, json_dumps(notes or {}), run_id),
             )
         conn.commit()
 
@@ -92,68 +106,151 @@ def refresh_schedule_for_season(season: int, session_type: str = "R") -> None:
 
 
 def _stage_load(staging: StagingBundle, race_id: str) -> None:
-    replace_staging_table("staging", "session_laps", race_id=race_id, df=staging.laps)
-    replace_staging_table("staging", "session_results", race_id=race_id, df=staging.results)
-    replace_staging_table("staging", "session_weather", race_id=race_id, df=staging.weather)
+    with get_conn() as conn:
+        for table, df in (
+            ("session_laps", staging.laps),
+            ("session_results", staging.results),
+            ("session_weather", staging.weather),
+        ):
+            replace_staging_table("staging", table, race_id=race_id, df=df, conn=conn)
+        conn.commit()
 
 
 def _upsert_curated(curated) -> None:
-    upsert_dataframe("curated", "dim_race", curated.dim_race, conflict_cols=["race_id"])
-    upsert_dataframe("curated", "dim_driver", curated.dim_driver, conflict_cols=["driver_id"])
-    upsert_dataframe("curated", "dim_team", curated.dim_team, conflict_cols=["team_id"])
-    upsert_dataframe(
-        "curated",
-        "dim_driver_team_season",
-        curated.dim_driver_team_season,
-        conflict_cols=["season", "driver_id", "team_id"],
-        update_cols=[],
-    )
-    upsert_dataframe(
-        "curated",
-        "fact_lap",
-        curated.fact_lap,
-        conflict_cols=["race_id", "driver_id", "lap_number"],
-    )
-    upsert_dataframe(
-        "curated",
-        "fact_session_results",
-        curated.fact_session_results,
-        conflict_cols=["race_id", "driver_id"],
-    )
-    upsert_dataframe(
-        "curated",
-        "fact_race_control",
-        curated.fact_race_control,
-        conflict_cols=["race_id", "lap_number"],
-    )
-    upsert_dataframe(
-        "curated",
-        "fact_weather_minute",
-        curated.fact_weather_minute,
-        conflict_cols=["race_id", "timestamp_utc"],
-    )
+    # One connection and one commit for the whole curated layer
+    with get_conn() as conn:
+        upsert_dataframe(
+            "curated", "dim_race", curated.dim_race, conflict_cols=["race_id"], conn=conn
+        )
+        upsert_dataframe(
+            "curated", "dim_driver", curated.dim_driver, conflict_cols=["driver_id"], conn=conn
+        )
+        upsert_dataframe(
+            "curated", "dim_team", curated.dim_team, conflict_cols=["team_id"], conn=conn
+        )
+        upsert_dataframe(
+            "curated",
+            "dim_driver_team_season",
+            curated.dim_driver_team_season,
+            conflict_cols=["season", "driver_id", "team_id"],
+            update_cols=[],
+            conn=conn,
+        )
+        upsert_dataframe(
+            "curated",
+            "fact_lap",
+            curated.fact_lap,
+            conflict_cols=["race_id", "driver_id", "lap_number"],
+            conn=conn,
+        )
+        upsert_dataframe(
+            "curated",
+            "fact_session_results",
+            curated.fact_session_results,
+            conflict_cols=["race_id", "driver_id"],
+            conn=conn,
+        )
+        upsert_dataframe(
+            "curated",
+            "fact_race_control",
+            curated.fact_race_control,
+            conflict_cols=["race_id", "lap_number"],
+            conn=conn,
+        )
+        upsert_dataframe(
+            "curated",
+            "fact_weather_minute",
+            curated.fact_weather_minute,
+            conflict_cols=["race_id", "timestamp_utc"],
+            conn=conn,
+        )
+        conn.commit()
 
 
-def _build_and_load_marts(race_id: str) -> None:
-    fact_lap = query_df(
-        "SELECT * FROM curated.fact_lap WHERE race_id = %(race_id)s",
-        params={"race_id": race_id},
-    )
-    fact_results = query_df(
-        "SELECT * FROM curated.fact_session_results WHERE race_id = %(race_id)s",
-        params={"race_id": race_id},
-    )
+def _read_mart_inputs(race_id: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Only the columns the mart builders read; both reads run concurrently
+    params = {"race_id": race_id}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        fact_lap_future = pool.submit(
+            query_df,
+            """
+            SELECT race_id, driver_id, lap_number, lap_time_ms, position,
+                   stint, compound, is_pit_in_lap
+            FROM curated.fact_lap
+            WHERE race_id = %(race_id)s
+            """,
+            params,
+        )
+        fact_results_future = pool.submit(
+            query_df,
+            "SELECT driver_id, team_id FROM curated.fact_session_results "
+            "WHERE race_id = %(race_id)s",
+            params,
+        )
+        return fact_lap_future.result(), fact_results_future.result()
+
+
+def _build_and_load_marts(
+    race_id: str,
+    fact_lap: pd.DataFrame | None = None,
+    fact_results: pd.DataFrame | None = None,
+) -> None:
+    # An in-process ingest passes the curated frames it has just upserted;
+    # standalone callers read them back from the warehouse
+    if fact_lap is None or fact_results is None:
+        fact_lap, fact_results = _read_mart_inputs(race_id)
 
     mart_gap = build_gap_timeline(fact_lap)
     mart_position = build_position_chart(fact_lap, fact_results)
     mart_stint = build_stint_summary(fact_lap)
 
-    replace_mart_table("marts", "mart_gap_timeline", race_id=race_id, df=mart_gap)
-    replace_mart_table("marts", "mart_position_chart", race_id=race_id, df=mart_position)
-    replace_mart_table("marts", "mart_stint_summary", race_id=race_id, df=mart_stint)
+    with get_conn() as conn:
+        for table, df in (
+            ("mart_gap_timeline", mart_gap),
+            ("mart_position_chart", mart_position),
+            ("mart_stint_summary", mart_stint),
+        ):
+            replace_mart_table("marts", table, race_id=race_id, df=df, conn=conn)
+        conn.commit()
+
+
+def _last_staging_hash(
+    race_id: str, season: int, round_number: int, session_type: str, code_version: str
+) -> str | None:
+    # Hash from the latest good run of the same code, provided the race's
+    # curated and mart rows are still flagged as loaded
+    df = query_df(
+        """
+        SELECT r.notes::jsonb ->> 'staging_hash' AS staging_hash
+        FROM metadata.ingestion_runs r
+        JOIN metadata.races_catalog c
+          ON c.race_id = %(race_id)s AND c.is_ingested
+        WHERE r.season = %(season)s
+          AND r.round = %(round)s
+          AND r.session_type = %(session_type)s
+          AND r.code_version = %(code_version)s
+          AND r.status IN ('success', 'cached')
+        ORDER BY r.finished_at DESC
+        LIMIT 1
+        """,
+        params={
+            "race_id": race_id,
+            "season": season,
+            "round": round_number,
+            "session_type": session_type,
+            "code_version": code_version,
+        },
+    )
+    return None if df.empty else df["staging_hash"].iloc[0]
 
 
 def _mark_race_ingested(race_id: str) -> None:
+    _mark_races_ingested([race_id])
+
+
+def _mark_races_ingested(race_ids: list[str]) -> None:
+    if not race_ids:
+        return
     with get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute(
@@ -161,9 +258,9 @@ def _mark_race_ingested(race_id: str) -> None:
                 UPDATE metadata.races_catalog
                 SET is_ingested = TRUE,
                     last_ingested_at = %(ts)s
-                WHERE race_id = %(race_id)s
+                WHERE race_id = ANY(%(race_ids)s)
                 """,
-                {"race_id": race_id, "ts": now_utc()},
+                {"race_ids": race_ids, "ts": now_utc()},
             )
         conn.commit()
 
@@ -206,17 +303,13 @@ def extract_to_staging(
 
 
 def load_staging_bundle(race_id: str) -> StagingBundle:
-    laps = query_df(
-        "SELECT * FROM staging.session_laps WHERE race_id = %(race_id)s",
-        params={"race_id": race_id},
-    )
-    results = query_df(
-        "SELECT * FROM staging.session_results WHERE race_id = %(race_id)s",
-        params={"race_id": race_id},
-    )
-    weather = query_df(
-        "SELECT * FROM staging.session_weather WHERE race_id = %(race_id)s",
-        params={"race_id": race_id},
+    params = {"race_id": race_id}
+    laps, results, weather = query_dfs(
+        [
+            ("SELECT * FROM staging.session_laps WHERE race_id = %(race_id)s", params),
+            ("SELECT * FROM staging.session_results WHERE race_id = %(race_id)s", params),
+            ("SELECT * FROM staging.session_weather WHERE race_id = %(race_id)s", params),
+        ]
     )
     return StagingBundle(laps=laps, results=results, weather=weather)
 
@@ -262,9 +355,18 @@ def ingest_single_race(
     round_number: int,
     session_type: str = "R",
     code_version: str = "dev",
+    force: bool = False,
+    skip_bootstrap: bool = False,
+    defer_mark: bool = False,
+    skip_unchanged: bool = False,
 ) -> dict[str, Any]:
-    bootstrap_warehouse()
-    refresh_schedule_for_season(season=season, session_type=session_type)
+    # Batch callers pass skip_bootstrap=True after bootstrapping the warehouse
+    # and refreshing the season schedule once up front, and defer_mark=True to
+    # flag every ingested race in one catalog UPDATE at the end of the batch.
+    # force=True re-fetches from FastF1 instead of using the cached extract.
+    if not skip_bootstrap:
+        bootstrap_warehouse()
+        refresh_schedule_for_season(season=season, session_type=session_type)
 
     run_id = _start_run(
         season=season,
@@ -278,11 +380,24 @@ def ingest_single_race(
 
     try:
         start = time.perf_counter()
-        extracted: SessionExtract = fetch_session_data(season, round_number, session_type)
+        extracted: SessionExtract = fetch_session_data(
+            season, round_number, session_type, force=force
+        )
         timings["extract_fetch"] = time.perf_counter() - start
 
         start = time.perf_counter()
         staging = build_staging_bundle(extracted, run_id=run_id)
+        staging_hash = staging_bundle_hash(staging)
+        if skip_unchanged and staging_hash == _last_staging_hash(
+            race_id, season, round_number, session_type, code_version
+        ):
+            # Opt-in: same data under the same code_version.  The hash only
+            # covers extracted data, so a local transform/mart change under
+            # an unchanged code_version (e.g. "dev") would be missed; hence
+            # not the default.
+            timings["extract_stage"] = time.perf_counter() - start
+            _finish_run(run_id, "cached", {"timings_sec": timings, "staging_hash": staging_hash})
+            return {"run_id": run_id, "race_id": race_id, "status": "cached", "timings": timings}
         _stage_load(staging=staging, race_id=race_id)
         timings["extract_stage"] = time.perf_counter() - start
 
@@ -301,17 +416,20 @@ def ingest_single_race(
         timings["transform_curated"] = time.perf_counter() - start
 
         start = time.perf_counter()
-        _build_and_load_marts(race_id)
+        _build_and_load_marts(
+            race_id, fact_lap=curated.fact_lap, fact_results=curated.fact_session_results
+        )
         timings["load_marts"] = time.perf_counter() - start
 
         start = time.perf_counter()
         passed, checks = run_quality_checks(run_id=run_id, race_id=race_id)
         timings["quality"] = time.perf_counter() - start
 
-        _mark_race_ingested(race_id)
+        if not defer_mark:
+            _mark_race_ingested(race_id)
 
         final_status = "success" if passed else "quality_failed"
-        notes = {"timings_sec": timings, "quality_checks": checks}
+        notes = {"timings_sec": timings, "quality_checks": checks, "staging_hash": staging_hash}
         _finish_run(run_id, final_status, notes)
 
         return {"run_id": run_id, "race_id": race_id, "status": final_status, "timings": timings}
@@ -337,10 +455,16 @@ def list_rounds_for_season(season: int, session_type: str = "R") -> list[int]:
 
 
 def backfill_season(
-    season: int, session_type: str = "R", code_version: str = "dev"
+    season: int,
+    session_type: str = "R",
+    code_version: str = "dev",
+    max_workers: int = 1,
+    force: bool = False,
+    skip_unchanged: bool = False,
 ) -> list[dict[str, Any]]:
     results: list[dict[str, Any]] = []
     try:
+        bootstrap_warehouse()
         rounds = list_rounds_for_season(season, session_type=session_type)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Failed to fetch rounds for season=%s", season)
@@ -351,28 +475,49 @@ def backfill_season(
                 "error": f"schedule_fetch_failed: {exc}",
             }
         ]
-
-    for rnd in rounds:
-        try:
-            results.append(
-                ingest_single_race(
-                    season=season,
-                    round_number=rnd,
-                    session_type=session_type,
-                    code_version=code_version,
-                )
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Backfill failed for season=%s round=%s", season, rnd)
-            results.append(
-                {
-                    "season": season,
-                    "round": rnd,
-                    "race_id": make_race_id(season, rnd, session_type),
-                    "status": "failed",
-                    "error": str(exc),
-                }
+    if not rounds:
+        return results
+
+    # Races are independent, so they run in parallel worker processes.  Spawned
+    # rather than forked: a forked child would inherit this process's idle
+    # psycopg connections and share their sockets.
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(rounds)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker_logging,
+    ) as pool:
+        futures = {
+            rnd: pool.submit(
+                ingest_single_race,
+                season=season,
+                round_number=rnd,
+                session_type=session_type,
+                code_version=code_version,
+                force=force,
+                skip_unchanged=skip_unchanged,
+                skip_bootstrap=True,
+                defer_mark=True,
             )
+            for rnd in rounds
+        }
+        for rnd, future in futures.items():
+            try:
+                results.append(future.result())
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Backfill failed for season=%s round=%s", season, rnd)
+                results.append(
+                    {
+                        "season": season,
+                        "round": rnd,
+                        "race_id": make_race_id(season, rnd, session_type),
+                        "status": "failed",
+                        "error": str(exc),
+                    }
+                )
+
+    _mark_races_ingested(
+        [r["race_id"] for r in results if r["status"] in ("success", "quality_failed")]
+    )
     return results
 
 
@@ -381,12 +526,22 @@ def backfill_range(
     season_end: int,
     session_type: str = "R",
     code_version: str = "dev",
+    max_workers: int = 1,
+    force: bool = False,
+    skip_unchanged: bool = False,
 ) -> list[dict[str, Any]]:
     results: list[dict[str, Any]] = []
     for season in range(season_start, season_end + 1):
         try:
             results.extend(
-                backfill_season(season=season, session_type=session_type, code_version=code_version)
+                backfill_season(
+                    season=season,
+                    session_type=session_type,
+                    code_version=code_version,
+                    max_workers=max_workers,
+                    force=force,
+                    skip_unchanged=skip_unchanged,
+                )
             )
         except Exception as exc:  # noqa: BLE001
             logger.exception("Backfill season crashed unexpectedly for season=%s", season)
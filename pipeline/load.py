@@ -1,45 +1,73 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 
 import pandas as pd
+import psycopg
 
 from pipeline.db import get_conn
 
+# Below this many rows the temp-table setup costs more than COPY saves
+_COPY_UPSERT_MIN_ROWS = 500
+
 
 def _q(identifier: str) -> str:
     return '"' + identifier.replace('"', '""') + '"'
 
 
-def _normalize_records(df: pd.DataFrame) -> list[dict]:
-    records = df.to_dict(orient="records")
-    for rec in records:
-        for key, value in list(rec.items()):
-            if pd.isna(value):
-                rec[key] = None
-    return records
+@contextmanager
+def _write_conn(conn: psycopg.Connection | None) -> Iterator[psycopg.Connection]:
+    # A caller-supplied connection belongs to the caller's transaction, which
+    # the caller commits; otherwise open one and commit this write on its own
+    if conn is not None:
+        yield conn
+        return
+    with get_conn() as own_conn:
+        yield own_conn
+        own_conn.commit()
 
 
-def upsert_dataframe(
-    schema: str,
-    table: str,
-    df: pd.DataFrame,
-    conflict_cols: Iterable[str],
-    update_cols: Iterable[str] | None = None,
-) -> None:
-    if df.empty:
-        return
+def _shrink(df: pd.DataFrame) -> pd.DataFrame:
+    # NULLs force integer columns (lap_number, position, *_ms) to float64, so
+    # they would go out as "84123.0" floats for the server to cast back.  Send
+    # whole-number float columns as ints: shorter on the wire, no cast, and
+    # COPY (which parses text against the column type) rejects "3.0" for
+    # INTEGER outright.
+    integral = [c for c in df.select_dtypes("float").columns if (df[c].dropna() % 1 == 0).all()]
+    return df.astype(dict.fromkeys(integral, "Int64")) if integral else df
 
-    cols = list(df.columns)
-    conflict_cols = list(conflict_cols)
-    update_cols = (
-        list(update_cols)
-        if update_cols is not None
-        else [c for c in cols if c not in conflict_cols]
-    )
 
+def _normalize_records(df: pd.DataFrame) -> list[list]:
+    # Positional rows in df.columns order, with every NaN/NaT/NA as None.  The
+    # mask is built per column in C instead of a pd.isna() call per cell.
+    df = _shrink(df)
+    return df.astype(object).where(df.notna(), None).to_numpy().tolist()
+
+
+# Statement text depends only on the target and its columns, and the same few
+# dozen shapes repeat for every race of a backfill, so render each once
+@lru_cache(maxsize=256)
+def _copy_sql(schema: str, table: str, cols: tuple[str, ...]) -> str:
     col_sql = ", ".join(_q(c) for c in cols)
-    values_sql = ", ".join(f"%({c})s" for c in cols)
+    return f"COPY {_q(schema)}.{_q(table)} ({col_sql}) FROM STDIN"
+
+
+@lru_cache(maxsize=256)
+def _upsert_sql(
+    schema: str,
+    table: str,
+    cols: tuple[str, ...],
+    conflict_cols: tuple[str, ...],
+    update_cols: tuple[str, ...],
+    source_table: str | None = None,
+) -> str:
+    col_sql = ", ".join(_q(c) for c in cols)
+    if source_table is None:
+        rows_sql = "VALUES (" + ", ".join(["%s"] * len(cols)) + ")"
+    else:
+        rows_sql = f"SELECT {col_sql} FROM {_q(source_table)}"
     conflict_sql = ", ".join(_q(c) for c in conflict_cols)
 
     if update_cols:
@@ -48,49 +76,95 @@ def upsert_dataframe(
     else:
         on_conflict_sql = "DO NOTHING"
 
-    sql = (
-        f"INSERT INTO {_q(schema)}.{_q(table)} ({col_sql}) VALUES ({values_sql}) "
+    return (
+        f"INSERT INTO {_q(schema)}.{_q(table)} ({col_sql}) {rows_sql} "
         f"ON CONFLICT ({conflict_sql}) {on_conflict_sql}"
     )
 
-    records = _normalize_records(df)
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.executemany(sql, records)
-        conn.commit()
 
+def _copy_rows(cur: psycopg.Cursor, schema: str, table: str, df: pd.DataFrame) -> None:
+    # Plain inserts into a freshly cleared race slice have no conflicts to
+    # resolve, so stream them through COPY rather than one INSERT per row
+    with cur.copy(_copy_sql(schema, table, tuple(df.columns))) as copy:
+        for row in _normalize_records(df):
+            copy.write_row(row)
 
-def replace_race_slice(schema: str, table: str, race_id: str, df: pd.DataFrame) -> None:
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(f"DELETE FROM {_q(schema)}.{_q(table)} WHERE race_id = %s", (race_id,))
-        conn.commit()
 
-    if not df.empty:
-        upsert_dataframe(schema=schema, table=table, df=df, conflict_cols=["race_id"])
+def upsert_dataframe(
+    schema: str,
+    table: str,
+    df: pd.DataFrame,
+    conflict_cols: Iterable[str],
+    update_cols: Iterable[str] | None = None,
+    conn: psycopg.Connection | None = None,
+) -> None:
+    if df.empty:
+        return
 
+    cols = tuple(df.columns)
+    conflict_cols = tuple(conflict_cols)
+    update_cols = (
+        tuple(update_cols)
+        if update_cols is not None
+        else tuple(c for c in cols if c not in conflict_cols)
+    )
 
-def replace_staging_table(schema: str, table: str, race_id: str, df: pd.DataFrame) -> None:
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(f"DELETE FROM {_q(schema)}.{_q(table)} WHERE race_id = %s", (race_id,))
-            if not df.empty:
-                cols = list(df.columns)
-                col_sql = ", ".join(_q(c) for c in cols)
-                values_sql = ", ".join(f"%({c})s" for c in cols)
-                sql = f"INSERT INTO {_q(schema)}.{_q(table)} ({col_sql}) VALUES ({values_sql})"
-                cur.executemany(sql, _normalize_records(df))
-        conn.commit()
-
-
-def replace_mart_table(schema: str, table: str, race_id: str, df: pd.DataFrame) -> None:
-    with get_conn() as conn:
-        with conn.cursor() as cur:
+    with _write_conn(conn) as write_conn, write_conn.cursor() as cur:
+        # Large frames go through COPY into a scratch table and one set-based
+        # INSERT ... SELECT.  A batch holding the same key twice would make that
+        # single statement touch one row twice, which Postgres rejects, so those
+        # keep the row-by-row path where the last duplicate wins.
+        if len(df) >= _COPY_UPSERT_MIN_ROWS and not df.duplicated(list(conflict_cols)).any():
+            scratch = f"_upsert_{table}"
+            cur.execute(
+                f"CREATE TEMP TABLE {_q(scratch)} "
+                f"(LIKE {_q(schema)}.{_q(table)} INCLUDING DEFAULTS)"
+            )
+            _copy_rows(cur, "pg_temp", scratch, df)
+            cur.execute(_upsert_sql(schema, table, cols, conflict_cols, update_cols, scratch))
+            cur.execute(f"DROP TABLE {_q(scratch)}")
+        else:
+            sql = _upsert_sql(schema, table, cols, conflict_cols, update_cols)
+            cur.executemany(sql, _normalize_records(df))
+
+
+def replace_race_slice(
+    schema: str,
+    table: str,
+    race_id: str,
+    df: pd.DataFrame,
+    conn: psycopg.Connection | None = None,
+) -> None:
+    with _write_conn(conn) as write_conn:
+        with write_conn.cursor() as cur:
             cur.execute(f"DELETE FROM {_q(schema)}.{_q(table)} WHERE race_id = %s", (race_id,))
-            if not df.empty:
-                cols = list(df.columns)
-                col_sql = ", ".join(_q(c) for c in cols)
-                values_sql = ", ".join(f"%({c})s" for c in cols)
-                sql = f"INSERT INTO {_q(schema)}.{_q(table)} ({col_sql}) VALUES ({values_sql})"
-                cur.executemany(sql, _normalize_records(df))
-        conn.commit()
+        if not df.empty:
+            upsert_dataframe(
+                schema=schema, table=table, df=df, conflict_cols=["race_id"], conn=write_conn
+            )
+
+
+def replace_staging_table(
+    schema: str,
+    table: str,
+    race_id: str,
+    df: pd.DataFrame,
+    conn: psycopg.Connection | None = None,
+) -> None:
+    with _write_conn(conn) as write_conn, write_conn.cursor() as cur:
+        cur.execute(f"DELETE FROM {_q(schema)}.{_q(table)} WHERE race_id = %s", (race_id,))
+        if not df.empty:
+            _copy_rows(cur, schema, table, df)
+
+
+def replace_mart_table(
+    schema: str,
+    table: str,
+    race_id: str,
+    df: pd.DataFrame,
+    conn: psycopg.Connection | None = None,
+) -> None:
+    with _write_conn(conn) as write_conn, write_conn.cursor() as cur:
+        cur.execute(f"DELETE FROM {_q(schema)}.{_q(table)} WHERE race_id = %s", (race_id,))
+        if not df.empty:
+            _copy_rows(cur, schema, table, df)
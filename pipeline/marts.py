@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 
@@ -19,26 +20,34 @@ def build_gap_timeline(fact_lap: pd.DataFrame) -> pd.DataFrame:
     df = df.dropna(subset=["lap_time_ms"])
     df["lap_time_ms"] = df["lap_time_ms"].astype(int)
     df = df.sort_values(["driver_id", "lap_number"])
-    df["elapsed_ms"] = df.groupby("driver_id")["lap_time_ms"].cumsum()
-
-    rows: list[dict] = []
-    for lap, group in df.groupby("lap_number"):
-        g = group.sort_values("elapsed_ms")
-        if len(g) < 2:
-            continue
-        leader = g.iloc[0]
-        p2 = g.iloc[1]
-        rows.append(
-            {
-                "race_id": leader["race_id"],
-                "lap_number": int(lap),
-                "leader_driver_id": leader["driver_id"],
-                "p2_driver_id": p2["driver_id"],
-                "gap_p2_to_leader_ms": int(p2["elapsed_ms"] - leader["elapsed_ms"]),
-            }
-        )
 
-    return pd.DataFrame(rows)
+    # Per-driver running total as one flat cumsum minus each driver's starting
+    # offset; rows are contiguous per driver after the sort
+    drivers = df["driver_id"].to_numpy()
+    lap_ms = df["lap_time_ms"].to_numpy()
+    total = lap_ms.cumsum()
+    starts = np.ones(len(drivers), dtype=bool)
+    starts[1:] = drivers[1:] != drivers[:-1]
+    offsets = (total - lap_ms)[starts]
+    df["elapsed_ms"] = total - offsets[starts.cumsum() - 1]
+
+    # Rank drivers within each lap by elapsed time, then pair P1 with P2;
+    # laps with a single running driver drop out of the inner join
+    df = df.sort_values(["lap_number", "elapsed_ms"], kind="stable")
+    rank = df.groupby("lap_number").cumcount()
+    leader = df[rank == 0].set_index("lap_number")
+    p2 = df[rank == 1].set_index("lap_number")
+    pairs = leader.join(p2[["driver_id", "elapsed_ms"]], how="inner", rsuffix="_p2")
+
+    return pd.DataFrame(
+        {
+            "race_id": pairs["race_id"].to_numpy(),
+            "lap_number": pairs.index.astype(int),
+            "leader_driver_id": pairs["driver_id"].to_numpy(),
+            "p2_driver_id": pairs["driver_id_p2"].to_numpy(),
+            "gap_p2_to_leader_ms": (pairs["elapsed_ms_p2"] - pairs["elapsed_ms"]).to_numpy(),
+        }
+    )
 
 
 def build_position_chart(
@@ -47,12 +56,15 @@ def build_position_chart(
     if fact_lap.empty:
         return pd.DataFrame(columns=["race_id", "driver_id", "lap_number", "position", "team_id"])
 
-    team_map = fact_session_results[["driver_id", "team_id"]].drop_duplicates()
-    out = fact_lap[["race_id", "driver_id", "lap_number", "position"]].merge(
-        team_map, on="driver_id", how="left"
-    )
+    # ~20 drivers: a dict lookup beats a hash-join merge.  fact_lap is keyed on
+    # (race_id, driver_id, lap_number), so with one team per driver no rows
+    # are duplicated and no dedup pass is needed.
+    team_map = fact_session_results.drop_duplicates("driver_id")
+    team_by_driver = dict(zip(team_map["driver_id"], team_map["team_id"], strict=True))
+    out = fact_lap[["race_id", "driver_id", "lap_number", "position"]].copy()
     out["lap_number"] = out["lap_number"].astype(int)
-    return out.drop_duplicates(subset=["race_id", "driver_id", "lap_number"])
+    out["team_id"] = out["driver_id"].map(team_by_driver)
+    return out
 
 
 def build_stint_summary(fact_lap: pd.DataFrame) -> pd.DataFrame:
@@ -72,12 +84,14 @@ def build_stint_summary(fact_lap: pd.DataFrame) -> pd.DataFrame:
             ]
         )
 
-    df = fact_lap.copy()
+    # Boolean-mask slices are already new frames, so no up-front copy is needed
+    df = fact_lap
 
     # Separate laps with known vs unknown stint info.
     # FastF1 sometimes returns NULL stint/compound for early laps (data gap).
-    known = df[df["stint"].notna()].copy()
-    unknown = df[df["stint"].isna()].copy()
+    has_stint = df["stint"].notna()
+    known = df[has_stint]
+    unknown = df[~has_stint].copy()
 
     # For unknown-stint laps, synthesize stint groups from consecutive lap runs.
     if not unknown.empty:
@@ -109,6 +123,9 @@ def build_stint_summary(fact_lap: pd.DataFrame) -> pd.DataFrame:
             ]
         )
 
+    # Pit-in lap number, NaN elsewhere, so its max folds into the same single
+    # groupby pass instead of a second groupby + merge
+    df = df.assign(_pit_lap=df["lap_number"].where(df["is_pit_in_lap"] == True))  # noqa: E712
     grouped = df.groupby(["race_id", "driver_id", "stint"], as_index=False)
     out = grouped.agg(
         start_lap=("lap_number", "min"),
@@ -117,15 +134,9 @@ def build_stint_summary(fact_lap: pd.DataFrame) -> pd.DataFrame:
         stint_laps=("lap_number", "count"),
         median_lap_ms=("lap_time_ms", "median"),
         avg_lap_ms=("lap_time_ms", "mean"),
+        pit_lap=("_pit_lap", "max"),
     )
 
-    pit_laps = (
-        df[df["is_pit_in_lap"] == True]  # noqa: E712
-        .groupby(["race_id", "driver_id", "stint"], as_index=False)["lap_number"]
-        .max()
-        .rename(columns={"lap_number": "pit_lap"})
-    )
-    out = out.merge(pit_laps, on=["race_id", "driver_id", "stint"], how="left")
     out["median_lap_ms"] = out["median_lap_ms"].round().astype("Int64")
     out["avg_lap_ms"] = out["avg_lap_ms"].round().astype("Int64")
     out["stint"] = out["stint"].astype(int)
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import json
-
 from pipeline.db import get_conn
 
 CHECKS_SQL = {
@@ -37,33 +35,44 @@ CHECKS_SQL = {
 }
 
 
-def run_quality_checks(run_id: str, race_id: str) -> tuple[bool, list[dict]]:
-    check_rows: list[dict] = []
-    overall_ok = True
+# Every check is evaluated and its result row written by one INSERT ... SELECT,
+# so a run's checks cost a single round trip and details never leave the server
+# only to be sent straight back
+_INSERT_CHECKS_SQL = (
+    """
+    INSERT INTO metadata.data_quality_checks (run_id, check_name, status, details_json)
+    SELECT %(run_id)s,
+           check_name,
+           CASE WHEN passed THEN 'pass' ELSE 'fail' END,
+           COALESCE(details, '{}'::jsonb)
+    FROM (
+"""
+    + "\n    UNION ALL\n".join(
+        f"SELECT '{check_name}' AS check_name, passed, details FROM ({sql}) AS c"
+        for check_name, sql in CHECKS_SQL.items()
+    )
+    + """
+    ) AS checks
+    RETURNING check_name, status, details_json::text
+"""
+)
+
 
+def run_quality_checks(run_id: str, race_id: str) -> tuple[bool, list[dict]]:
     with get_conn() as conn:
         with conn.cursor() as cur:
-            for check_name, sql in CHECKS_SQL.items():
-                cur.execute(sql, {"race_id": race_id})
-                passed, details = cur.fetchone()
-                status = "pass" if passed else "fail"
-                overall_ok = overall_ok and bool(passed)
-
-                record = {
-                    "run_id": run_id,
-                    "check_name": check_name,
-                    "status": status,
-                    "details_json": json.dumps(details if details is not None else {}),
-                }
-                check_rows.append(record)
-
-            cur.executemany(
-                """
-                INSERT INTO metadata.data_quality_checks (run_id, check_name, status, details_json)
-                VALUES (%(run_id)s, %(check_name)s, %(status)s, %(details_json)s::jsonb)
-                """,
-                check_rows,
-            )
+            cur.execute(_INSERT_CHECKS_SQL, {"run_id": run_id, "race_id": race_id})
+            written = {check_name: (status, details) for check_name, status, details in cur}
         conn.commit()
 
+    check_rows = [
+        {
+            "run_id": run_id,
+            "check_name": check_name,
+            "status": written[check_name][0],
+            "details_json": written[check_name][1],
+        }
+        for check_name in CHECKS_SQL
+    ]
+    overall_ok = all(row["status"] == "pass" for row in check_rows)
     return overall_ok, check_rows
@@ -1,11 +1,58 @@
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 from pipeline.extract import SessionExtract
-from pipeline.utils import derive_race_control_flags, stable_id, timedelta_to_ms
+from pipeline.utils import stable_id
+
+# FastF1 source columns read by build_staging_bundle
+_LAP_COLUMNS = (
+    "Driver",
+    "DriverNumber",
+    "LapNumber",
+    "Position",
+    "LapTime",
+    "Stint",
+    "Compound",
+    "TyreLife",
+    "FreshTyre",
+    "IsAccurate",
+    "PitInTime",
+    "PitOutTime",
+    "TrackStatus",
+    "Sector1Time",
+    "Sector2Time",
+    "Sector3Time",
+)
+_RESULT_COLUMNS = (
+    "Abbreviation",
+    "DriverNumber",
+    "FirstName",
+    "LastName",
+    "FullName",
+    "TeamName",
+    "TeamColor",
+    "GridPosition",
+    "Position",
+    "ClassifiedPosition",
+    "Status",
+    "Points",
+    "Time",
+)
+_WEATHER_COLUMNS = (
+    "Time",
+    "AirTemp",
+    "TrackTemp",
+    "Humidity",
+    "Pressure",
+    "Rainfall",
+    "WindDirection",
+    "WindSpeed",
+)
 
 
 @dataclass
@@ -27,28 +74,48 @@ class CuratedBundle:
     fact_weather_minute: pd.DataFrame
 
 
-def _safe_int(value: object) -> int | None:
-    if value is None or pd.isna(value):
-        return None
-    try:
-        return int(value)
-    except Exception:
-        return None
+def staging_bundle_hash(staging: StagingBundle) -> str:
+    # Content fingerprint of what was extracted; run_id differs on every run
+    # and is left out so an unchanged session hashes the same each time
+    digest = hashlib.blake2b(digest_size=16)
+    for df in (staging.laps, staging.results, staging.weather):
+        frame = df.drop(columns="run_id", errors="ignore")
+        digest.update("|".join(map(str, frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
 
 
-def _safe_float(value: object) -> float | None:
-    if value is None or pd.isna(value):
-        return None
-    try:
-        return float(value)
-    except Exception:
-        return None
+def _to_int(values: pd.Series) -> pd.Series:
+    # Column-wise int() with None for anything missing or unparseable
+    num = pd.to_numeric(values, errors="coerce").astype("float64")
+    return np.trunc(num.where(np.isfinite(num))).astype("Int64")
+
+
+def _to_float(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values, errors="coerce").astype("float64")
+
+
+def _to_str(values: pd.Series) -> pd.Series:
+    # str() of every present value, None where missing; masking on notna()
+    # replaces a second .replace({"nan": None, "None": None}) pass
+    return values.astype(str).where(values.notna(), None)
+
+
+def _to_ms(values: pd.Series) -> pd.Series:
+    # Whole-column timedelta -> integer milliseconds on the int64 ns buffer in
+    # one vectorised pass; unparseable values become NA
+    return (pd.to_timedelta(values, errors="coerce") // pd.Timedelta(milliseconds=1)).astype(
+        "Int64"
+    )
 
 
 def build_staging_bundle(data: SessionExtract, run_id: str) -> StagingBundle:
-    laps = data.laps.copy()
-    results = data.results.copy()
-    weather = data.weather.copy()
+    # One reindex per frame: any column FastF1 did not return comes back as
+    # all-NaN, so the builders below index directly instead of .get() with a
+    # throwaway empty Series per column
+    laps = data.laps.reindex(columns=_LAP_COLUMNS)
+    results = data.results.reindex(columns=_RESULT_COLUMNS)
+    weather = data.weather.reindex(columns=_WEATHER_COLUMNS)
 
     laps_df = pd.DataFrame(
         {
@@ -57,35 +124,27 @@ def build_staging_bundle(data: SessionExtract, run_id: str) -> StagingBundle:
             "season": data.season,
             "round": data.round_number,
             "session_type": data.session_type,
-            "driver_code": laps.get("Driver", pd.Series(dtype="object")).astype(str),
-            "driver_number": laps.get("DriverNumber", pd.Series(dtype="object")).astype(str),
-            "lap_number": laps.get("LapNumber", pd.Series(dtype="float")).map(_safe_int),
-            "position": laps.get("Position", pd.Series(dtype="float")).map(_safe_int),
-            "lap_time_ms": laps.get("LapTime", pd.Series(dtype="object")).map(timedelta_to_ms),
-            "stint": laps.get("Stint", pd.Series(dtype="float")).map(_safe_int),
-            "compound": laps.get("Compound", pd.Series(dtype="object")).astype(str),
-            "tyre_life_laps": laps.get("TyreLife", pd.Series(dtype="float")).map(_safe_int),
-            "fresh_tyre": laps.get("FreshTyre", pd.Series(dtype="bool")),
-            "is_accurate": laps.get("IsAccurate", pd.Series(dtype="bool")),
-            "is_pit_in_lap": laps.get("PitInTime", pd.Series(dtype="object")).notna(),
-            "is_pit_out_lap": laps.get("PitOutTime", pd.Series(dtype="object")).notna(),
-            "pit_in_time_ms": laps.get("PitInTime", pd.Series(dtype="object")).map(timedelta_to_ms),
-            "pit_out_time_ms": laps.get("PitOutTime", pd.Series(dtype="object")).map(
-                timedelta_to_ms
-            ),
-            "track_status_flags": laps.get("TrackStatus", pd.Series(dtype="object")).astype(str),
-            "sector1_ms": laps.get("Sector1Time", pd.Series(dtype="object")).map(timedelta_to_ms),
-            "sector2_ms": laps.get("Sector2Time", pd.Series(dtype="object")).map(timedelta_to_ms),
-            "sector3_ms": laps.get("Sector3Time", pd.Series(dtype="object")).map(timedelta_to_ms),
+            "driver_code": _to_str(laps["Driver"]),
+            "driver_number": _to_str(laps["DriverNumber"]),
+            "lap_number": _to_int(laps["LapNumber"]),
+            "position": _to_int(laps["Position"]),
+            "lap_time_ms": _to_ms(laps["LapTime"]),
+            "stint": _to_int(laps["Stint"]),
+            "compound": _to_str(laps["Compound"]),
+            "tyre_life_laps": _to_int(laps["TyreLife"]),
+            "fresh_tyre": laps["FreshTyre"],
+            "is_accurate": laps["IsAccurate"],
+            "is_pit_in_lap": laps["PitInTime"].notna(),
+            "is_pit_out_lap": laps["PitOutTime"].notna(),
+            "pit_in_time_ms": _to_ms(laps["PitInTime"]),
+            "pit_out_time_ms": _to_ms(laps["PitOutTime"]),
+            "track_status_flags": _to_str(laps["TrackStatus"]),
+            "sector1_ms": _to_ms(laps["Sector1Time"]),
+            "sector2_ms": _to_ms(laps["Sector2Time"]),
+            "sector3_ms": _to_ms(laps["Sector3Time"]),
         }
     )
     laps_df = laps_df[laps_df["lap_number"].notna()].copy()
-    laps_df["driver_code"] = laps_df["driver_code"].replace({"nan": None, "None": None})
-    laps_df["driver_number"] = laps_df["driver_number"].replace({"nan": None, "None": None})
-    laps_df["compound"] = laps_df["compound"].replace({"nan": None, "None": None})
-    laps_df["track_status_flags"] = laps_df["track_status_flags"].replace(
-        {"nan": None, "None": None}
-    )
 
     results_df = pd.DataFrame(
         {
@@ -94,40 +153,34 @@ def build_staging_bundle(data: SessionExtract, run_id: str) -> StagingBundle:
             "season": data.season,
             "round": data.round_number,
             "session_type": data.session_type,
-            "driver_code": results.get("Abbreviation", pd.Series(dtype="object")).astype(str),
-            "driver_number": results.get("DriverNumber", pd.Series(dtype="object")).astype(str),
-            "first_name": results.get("FirstName", pd.Series(dtype="object")).astype(str),
-            "last_name": results.get("LastName", pd.Series(dtype="object")).astype(str),
-            "full_name": results.get("FullName", pd.Series(dtype="object")).astype(str),
-            "team_name": results.get("TeamName", pd.Series(dtype="object")).astype(str),
-            "team_color": results.get("TeamColor", pd.Series(dtype="object")).astype(str),
-            "grid_position": results.get("GridPosition", pd.Series(dtype="float")).map(_safe_int),
-            "finish_position": results.get("Position", pd.Series(dtype="float")).map(_safe_int),
-            "classified_position": results.get(
-                "ClassifiedPosition", pd.Series(dtype="object")
-            ).astype(str),
-            "status": results.get("Status", pd.Series(dtype="object")).astype(str),
-            "points": results.get("Points", pd.Series(dtype="float")).map(_safe_float),
-            "race_time_ms": results.get("Time", pd.Series(dtype="object")).map(timedelta_to_ms),
+            "driver_code": _to_str(results["Abbreviation"]),
+            "driver_number": _to_str(results["DriverNumber"]),
+            "first_name": _to_str(results["FirstName"]),
+            "last_name": _to_str(results["LastName"]),
+            "full_name": _to_str(results["FullName"]),
+            "team_name": _to_str(results["TeamName"]),
+            "team_color": _to_str(results["TeamColor"]),
+            "grid_position": _to_int(results["GridPosition"]),
+            "finish_position": _to_int(results["Position"]),
+            "classified_position": _to_str(results["ClassifiedPosition"]),
+            "status": _to_str(results["Status"]),
+            "points": _to_float(results["Points"]),
+            "race_time_ms": _to_ms(results["Time"]),
         }
     )
-    for col in [
-        "driver_code",
-        "driver_number",
-        "first_name",
-        "last_name",
-        "full_name",
-        "team_name",
-        "team_color",
-        "classified_position",
-        "status",
-    ]:
-        results_df[col] = results_df[col].replace({"nan": None, "None": None})
-
-    weather_time = weather.get("Time", pd.Series(dtype="object"))
-    weather_ts = pd.to_datetime(weather_time, utc=True, errors="coerce")
-    if weather_ts.isna().all():
-        weather_td = pd.to_timedelta(weather_time, errors="coerce")
+
+    weather_time = weather["Time"]
+    if weather_time.dtype.kind == "m":
+        # FastF1's usual shape: session-relative offsets, which need no
+        # datetime parse (and full-column NaT check) before being anchored
+        weather_td = weather_time
+        weather_ts = pd.Series(pd.NaT, index=weather_time.index, dtype="datetime64[ns, UTC]")
+    else:
+        weather_ts = pd.to_datetime(weather_time, utc=True, errors="coerce")
+        weather_td = (
+            pd.to_timedelta(weather_time, errors="coerce") if weather_ts.isna().all() else None
+        )
+    if weather_td is not None:
         race_anchor = pd.to_datetime(data.race_datetime_utc, utc=True, errors="coerce")
         if pd.notna(race_anchor):
             weather_ts = race_anchor + weather_td
@@ -137,13 +190,13 @@ def build_staging_bundle(data: SessionExtract, run_id: str) -> StagingBundle:
             "run_id": run_id,
             "race_id": data.race_id,
             "timestamp_utc": weather_ts,
-            "air_temp_c": weather.get("AirTemp", pd.Series(dtype="float")).map(_safe_float),
-            "track_temp_c": weather.get("TrackTemp", pd.Series(dtype="float")).map(_safe_float),
-            "humidity_pct": weather.get("Humidity", pd.Series(dtype="float")).map(_safe_float),
-            "pressure_mbar": weather.get("Pressure", pd.Series(dtype="float")).map(_safe_float),
-            "rainfall": weather.get("Rainfall", pd.Series(dtype="bool")),
-            "wind_dir_deg": weather.get("WindDirection", pd.Series(dtype="float")).map(_safe_float),
-            "wind_speed_ms": weather.get("WindSpeed", pd.Series(dtype="float")).map(_safe_float),
+            "air_temp_c": _to_float(weather["AirTemp"]),
+            "track_temp_c": _to_float(weather["TrackTemp"]),
+            "humidity_pct": _to_float(weather["Humidity"]),
+            "pressure_mbar": _to_float(weather["Pressure"]),
+            "rainfall": weather["Rainfall"],
+            "wind_dir_deg": _to_float(weather["WindDirection"]),
+            "wind_speed_ms": _to_float(weather["WindSpeed"]),
         }
     )
     weather_df = weather_df[weather_df["timestamp_utc"].notna()].copy()
@@ -161,9 +214,11 @@ def build_curated_bundle(
     race_date_utc: object,
     staging: StagingBundle,
 ) -> CuratedBundle:
-    laps = staging.laps.copy()
-    results = staging.results.copy()
-    weather = staging.weather.copy()
+    # Read-only from here on: every derived frame is a new object (assign,
+    # merge, groupby), so the staging frames are used without copying
+    laps = staging.laps
+    results = staging.results
+    weather = staging.weather
 
     dim_race = pd.DataFrame(
         [
@@ -195,31 +250,34 @@ def build_curated_bundle(
     # Ensure one stable driver row per 3-letter driver code across all seasons.
     # FastF1 metadata can vary by race (e.g., missing first/last name), so we pick
     # the most complete row for each code and derive ID from code only.
-    for col in ["driver_number", "first_name", "last_name", "full_name"]:
-        driver_base[f"has_{col}"] = driver_base[col].notna().astype(int)
-    driver_base["completeness"] = driver_base[
-        ["has_driver_number", "has_first_name", "has_last_name", "has_full_name"]
-    ].sum(axis=1)
-    driver_base = driver_base.sort_values(
-        ["driver_code", "completeness"],
-        ascending=[True, False],
+    driver_base["completeness"] = (
+        driver_base[["driver_number", "first_name", "last_name", "full_name"]]
+        .notna()
+        .to_numpy()
+        .sum(axis=1)
     )
-    driver_base = driver_base.drop_duplicates(subset=["driver_code"], keep="first")
-    driver_base["driver_id"] = driver_base["driver_code"].map(lambda code: stable_id("drv", [code]))
+    # idxmax keeps the first of equally complete rows, as the stable sort +
+    # drop_duplicates(keep="first") did, without sorting the whole frame
+    best_rows = driver_base.groupby("driver_code")["completeness"].idxmax()
+    driver_base = driver_base.loc[best_rows]
+    # One row per code here, so each ID is hashed exactly once
+    driver_base["driver_id"] = [stable_id("drv", [code]) for code in driver_base["driver_code"]]
     dim_driver = driver_base[
         ["driver_id", "driver_code", "driver_number", "first_name", "last_name", "full_name"]
     ]
 
-    team_base = results[["team_name", "team_color"]].drop_duplicates()
-    team_base = team_base[team_base["team_name"].notna()].copy()
-    team_base["team_id"] = team_base["team_name"].map(lambda t: stable_id("team", [t]))
-    dim_team = team_base[["team_id", "team_name", "team_color"]].drop_duplicates(subset=["team_id"])
+    # First row per team name, deduplicated before hashing rather than after
+    team_base = results[["team_name", "team_color"]].dropna(subset=["team_name"])
+    team_base = team_base.drop_duplicates(subset=["team_name"])
+    team_base["team_id"] = [stable_id("team", [name]) for name in team_base["team_name"]]
+    dim_team = team_base[["team_id", "team_name", "team_color"]]
 
-    mapping_driver = dim_driver[["driver_code", "driver_id"]]
-    mapping_team = dim_team[["team_name", "team_id"]]
+    # ~20 drivers and ~10 teams: dict lookups beat hash-join merges, and the
+    # codes/names are unique in the dims so no rows can fan out
+    driver_by_code = dict(zip(dim_driver["driver_code"], dim_driver["driver_id"], strict=True))
+    team_by_name = dict(zip(dim_team["team_name"], dim_team["team_id"], strict=True))
 
-    fact_lap = laps.merge(mapping_driver, on="driver_code", how="left")
-    fact_lap["race_id"] = race_id
+    fact_lap = laps.assign(driver_id=laps["driver_code"].map(driver_by_code), race_id=race_id)
     fact_lap = fact_lap[
         [
             "race_id",
@@ -245,21 +303,16 @@ def build_curated_bundle(
     fact_lap["lap_number"] = fact_lap["lap_number"].astype(int)
     fact_lap = fact_lap.drop_duplicates(subset=["race_id", "driver_id", "lap_number"])
 
-    fact_results = results.merge(mapping_driver, on="driver_code", how="left").merge(
-        mapping_team, on="team_name", how="left"
+    fact_results = results.assign(
+        driver_id=results["driver_code"].map(driver_by_code),
+        team_id=results["team_name"].map(team_by_name),
     )
 
-    winner_time = None
-    winner_rows = fact_results[fact_results["finish_position"] == 1]
-    if not winner_rows.empty:
-        winner_time = winner_rows.iloc[0]["race_time_ms"]
-
-    def _gap_to_winner(value: object) -> int | None:
-        if winner_time is None or pd.isna(winner_time) or value is None or pd.isna(value):
-            return None
-        return int(value - winner_time)
-
-    fact_results["gap_to_winner_ms"] = fact_results["race_time_ms"].map(_gap_to_winner)
+    # Nullable-int subtraction: a missing winner or driver time yields NA
+    race_time = fact_results["race_time_ms"].astype("Int64")
+    winner_times = race_time[fact_results["finish_position"] == 1]
+    winner_time = winner_times.iloc[0] if not winner_times.empty else pd.NA
+    fact_results["gap_to_winner_ms"] = race_time - winner_time
 
     fact_session_results = fact_results[
         [
@@ -281,25 +334,26 @@ def build_curated_bundle(
     dts["season"] = season
     dim_driver_team_season = dts[["season", "driver_id", "team_id"]]
 
-    race_control = fact_lap[["race_id", "lap_number", "track_status_flags"]].copy()
-    flag_df = race_control["track_status_flags"].apply(derive_race_control_flags).apply(pd.Series)
-    race_control = pd.concat([race_control[["race_id", "lap_number"]], flag_df], axis=1)
-    fact_race_control = (
-        race_control.groupby(["race_id", "lap_number"], as_index=False)
-        .agg(
-            {
-                "is_sc": "max",
-                "is_vsc": "max",
-                "is_red_flag": "max",
-                "is_yellow_flag": "max",
-            }
-        )
-        .sort_values(["race_id", "lap_number"])
-    )
-
-    weather_min = weather.copy()
-    weather_min["timestamp_utc"] = pd.to_datetime(weather_min["timestamp_utc"], utc=True).dt.floor(
-        "min"
+    # FastF1 track status is a string of compact digit flags; the digit table
+    # below is tested on the status strings as one (laps x chars) byte matrix
+    status = fact_lap["track_status_flags"].fillna("").astype(str).to_numpy(dtype=bytes)
+    status_chars = status.view(np.uint8).reshape(len(status), status.itemsize)
+    # fact_lap holds a single race, so the per-lap OR of each flag is a
+    # bincount scatter over factorized lap numbers rather than a 2-key groupby
+    lap_idx, lap_numbers = pd.factorize(fact_lap["lap_number"], sort=True)
+    fact_race_control = pd.DataFrame({"race_id": race_id, "lap_number": lap_numbers})
+    for name, digits in (
+        ("is_sc", b"4"),
+        ("is_vsc", b"67"),
+        ("is_red_flag", b"5"),
+        ("is_yellow_flag", b"23"),
+    ):
+        hit = np.isin(status_chars, list(digits)).any(axis=1)
+        counts = np.bincount(lap_idx, weights=hit, minlength=len(lap_numbers))
+        fact_race_control[name] = counts > 0
+
+    weather_min = weather.assign(
+        timestamp_utc=pd.to_datetime(weather["timestamp_utc"], utc=True).dt.floor("min")
     )
     fact_weather_minute = (
         weather_min.groupby(["race_id", "timestamp_utc"], as_index=False)
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import argparse
-import os
-import subprocess
+import multiprocessing
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from pipeline.db import bootstrap_warehouse, query_df
-from pipeline.ingest import refresh_schedule_for_season
+from pipeline.ingest import ingest_single_race, refresh_schedule_for_season
+
+# Each race still runs in its own process, so a hung ingest can be killed on
+# timeout, but it is forked from a server that has already imported the
+# pipeline (pandas, FastF1) instead of starting a fresh interpreter per race.
+# The server never opens a database connection, so none are shared.
+_INGEST_CONTEXT = multiprocessing.get_context("forkserver")
+_INGEST_CONTEXT.set_forkserver_preload(["pipeline.ingest"])
 
 
 def parse_args() -> argparse.Namespace:
@@ -25,33 +33,28 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--session-type", type=str, default="R")
     parser.add_argument("--code-version", type=str, default="dev")
     parser.add_argument("--single-timeout-seconds", type=int, default=1200)
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Races ingested concurrently within a season (--sleep-race applies per worker)",
+    )
     return parser.parse_args()
 
 
-def _missing_rounds(season: int, session_type: str) -> list[int]:
+def _missing_by_season(
+    season_start: int, season_end: int, session_type: str
+) -> dict[int, list[int]]:
+    # One round trip per pass for every season's outstanding rounds
     missing = query_df(
         """
-        SELECT round
-        FROM metadata.races_catalog
-        WHERE season = %(season)s
-          AND session_type = %(session_type)s
-          AND round > 0
-          AND is_ingested = FALSE
-        ORDER BY round
-        """,
-        {"season": season, "session_type": session_type},
-    )
-    return [int(r) for r in missing["round"].tolist()]
-
-
-def _remaining_count(season_start: int, season_end: int, session_type: str) -> int:
-    remaining = query_df(
-        """
-        SELECT COUNT(*) AS c
+        SELECT season, round
         FROM metadata.races_catalog
         WHERE season BETWEEN %(season_start)s AND %(season_end)s
           AND session_type = %(session_type)s
+          AND round > 0
           AND is_ingested = FALSE
+        ORDER BY season, round
         """,
         {
             "season_start": season_start,
@@ -59,10 +62,14 @@ def _remaining_count(season_start: int, season_end: int, session_type: str) -> i
             "session_type": session_type,
         },
     )
-    return int(remaining.iloc[0]["c"]) if not remaining.empty else 0
+    by_season: dict[int, list[int]] = {}
+    for season, round_number in zip(missing["season"], missing["round"], strict=True):
+        by_season.setdefault(int(season), []).append(int(round_number))
+    return by_season
 
 
-def _print_totals(season_start: int, season_end: int, session_type: str) -> None:
+def _print_totals(season_start: int, season_end: int, session_type: str) -> int:
+    # Also the pass's remaining count, so that needs no query of its own
     totals = query_df(
         """
         SELECT season,
@@ -83,8 +90,17 @@ def _print_totals(season_start: int, season_end: int, session_type: str) -> None
     print("season totals:")
     if totals.empty:
         print("  (no schedule rows found)")
-    else:
-        print(totals.to_string(index=False))
+        return 0
+    print(totals.to_string(index=False))
+    return int((totals["total"] - totals["ingested"]).sum())
+
+
+def _ingest_in_child(**kwargs: object) -> None:
+    try:
+        ingest_single_race(**kwargs)
+    except Exception:  # noqa: BLE001
+        # ingest_single_race has already logged the failure
+        raise SystemExit(1) from None
 
 
 def _run_single_ingest(
@@ -94,34 +110,53 @@ def _run_single_ingest(
     code_version: str,
     timeout_seconds: int,
 ) -> bool:
-    repo_root = Path(__file__).resolve().parents[1]
-    cmd = [
-        sys.executable,
-        "scripts/run_ingest.py",
-        "single",
-        "--season",
-        str(season),
-        "--round",
-        str(round_number),
-        "--session-type",
-        session_type,
-    ]
-    env = os.environ.copy()
-    env["CODE_VERSION"] = code_version
+    process = _INGEST_CONTEXT.Process(
+        target=_ingest_in_child,
+        kwargs={
+            "season": season,
+            "round_number": round_number,
+            "session_type": session_type,
+            "code_version": code_version,
+            # main() bootstraps and refreshes each season's schedule already
+            "skip_bootstrap": True,
+        },
+    )
+    process.start()
+    process.join(timeout_seconds)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return False
+    return process.exitcode == 0
+
 
+def _ingest_round(season: int, round_number: int, args: argparse.Namespace) -> bool:
+    success = False
     try:
-        completed = subprocess.run(  # noqa: S603
-            cmd,
-            cwd=repo_root,
-            env=env,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=timeout_seconds,
-            check=False,
+        success = _run_single_ingest(
+            season=season,
+            round_number=round_number,
+            session_type=args.session_type,
+            code_version=args.code_version,
+            timeout_seconds=args.single_timeout_seconds,
         )
-        return completed.returncode == 0
-    except subprocess.TimeoutExpired:
-        return False
+        if success:
+            print(
+                f"ingest_ok season={season} round={round_number} status=success",
+                flush=True,
+            )
+        else:
+            print(
+                f"ingest_fail season={season} round={round_number} error=non_zero_or_timeout",
+                flush=True,
+            )
+    except Exception as exc:  # noqa: BLE001
+        print(
+            f"ingest_fail season={season} round={round_number} error={exc}",
+            flush=True,
+        )
+    time.sleep(args.sleep_race)
+    return success
 
 
 def main() -> None:
@@ -132,51 +167,31 @@ def main() -> None:
         print(f"=== pass {current_pass}/{args.max_passes} ===", flush=True)
         any_progress = False
 
+        seasons = []
         for season in range(args.season_start, args.season_end + 1):
             try:
                 refresh_schedule_for_season(season=season, session_type=args.session_type)
                 print(f"schedule_ok season={season}", flush=True)
+                seasons.append(season)
             except Exception as exc:  # noqa: BLE001
                 print(f"schedule_fail season={season} error={exc}", flush=True)
-                continue
-
-            rounds = _missing_rounds(season=season, session_type=args.session_type)
-            print(f"season={season} missing={rounds}", flush=True)
 
-            for round_number in rounds:
-                try:
-                    success = _run_single_ingest(
-                        season=season,
-                        round_number=round_number,
-                        session_type=args.session_type,
-                        code_version=args.code_version,
-                        timeout_seconds=args.single_timeout_seconds,
-                    )
-                    if success:
-                        print(
-                            f"ingest_ok season={season} round={round_number} status=success",
-                            flush=True,
-                        )
-                        any_progress = True
-                    else:
-                        print(
-                            f"ingest_fail season={season} round={round_number} "
-                            f"error=non_zero_or_timeout",
-                            flush=True,
-                        )
-                except Exception as exc:  # noqa: BLE001
-                    print(
-                        f"ingest_fail season={season} round={round_number} error={exc}",
-                        flush=True,
-                    )
-                time.sleep(args.sleep_race)
-
-        _print_totals(
+        missing = _missing_by_season(
             season_start=args.season_start,
             season_end=args.season_end,
             session_type=args.session_type,
         )
-        remaining = _remaining_count(
+        for season in seasons:
+            rounds = missing.get(season, [])
+            print(f"season={season} missing={rounds}", flush=True)
+
+            # Each ingest is its own process, so threads are enough to run
+            # several at once; the GIL is released while waiting on them
+            with ThreadPoolExecutor(max_workers=max(1, args.parallel)) as pool:
+                outcomes = list(pool.map(partial(_ingest_round, season, args=args), rounds))
+            any_progress = any_progress or any(outcomes)
+
+        remaining = _print_totals(
             season_start=args.season_start,
             season_end=args.season_end,
             session_type=args.session_type,
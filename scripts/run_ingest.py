@@ -19,6 +19,25 @@ def main() -> None:
     parser.add_argument("--session-type", default="R")
     parser.add_argument("--season-start", type=int)
     parser.add_argument("--season-end", type=int)
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=1,
+        help="Races ingested in parallel; each worker adds its own load on the FastF1 sources",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-fetch from FastF1, ignoring the cached extract"
+    )
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Skip races whose extracted data matches their last good run under this CODE_VERSION",
+    )
+    parser.add_argument(
+        "--skip-bootstrap",
+        action="store_true",
+        help="Assume the warehouse is bootstrapped and the season schedule is current",
+    )
     args = parser.parse_args()
 
     settings = get_settings()
@@ -31,6 +50,9 @@ def main() -> None:
             round_number=args.round_number,
             session_type=args.session_type,
             code_version=settings.code_version,
+            force=args.force,
+            skip_unchanged=args.skip_unchanged,
+            skip_bootstrap=args.skip_bootstrap,
         )
     elif args.mode == "season":
         if args.season is None:
@@ -39,6 +61,9 @@ def main() -> None:
             season=args.season,
             session_type=args.session_type,
             code_version=settings.code_version,
+            max_workers=args.max_workers,
+            force=args.force,
+            skip_unchanged=args.skip_unchanged,
         )
     else:
         if args.season_start is None or args.season_end is None:
@@ -48,6 +73,9 @@ def main() -> None:
             season_end=args.season_end,
             session_type=args.session_type,
             code_version=settings.code_version,
+            max_workers=args.max_workers,
+            force=args.force,
+            skip_unchanged=args.skip_unchanged,
         )
 
     print(json.dumps(result, default=str, indent=2))
@@ -1,6 +1,7 @@
 """Populate wikipedia_url and formula1_url for all ingested races.
 
-Idempotent: safe to re-run. Uses ALTER TABLE ADD COLUMN IF NOT EXISTS
+Idempotent: safe to re-run, and rows whose links are already current are
+not rewritten. Uses ALTER TABLE ADD COLUMN IF NOT EXISTS
 so it works on databases created before these columns were added to
 init_warehouse.sql.
 
@@ -247,7 +248,9 @@ def _build_f1_com_url(season: int, round_number: int) -> str | None:
 # Main
 # ---------------------------------------------------------------------------
 def main() -> None:
-    with get_conn() as conn:
+    # One transaction for the DDL and the link updates: both land or neither
+    # does, with a single commit (also on the early "no races" return)
+    with get_conn() as conn, conn.transaction():
         with conn.cursor() as cur:
             # 1) Ensure columns exist (idempotent for existing DBs)
             cur.execute(
@@ -256,7 +259,6 @@ def main() -> None:
             cur.execute(
                 "ALTER TABLE metadata.races_catalog " "ADD COLUMN IF NOT EXISTS formula1_url TEXT"
             )
-            conn.commit()
 
             # 2) Fetch all race rows
             cur.execute(
@@ -271,21 +273,29 @@ def main() -> None:
                 print("No races found in metadata.races_catalog.")
                 return
 
-            # 3) Build and apply URLs
-            updated = 0
-            for race_id, season, round_number, event_name in rows:
-                wiki_url = _build_wikipedia_url(season, round_number, event_name)
-                f1_url = _build_f1_com_url(season, round_number)
+            # 3) Build every URL, then apply them in one set-based UPDATE
+            race_ids = [race_id for race_id, _, _, _ in rows]
+            wiki_urls = [
+                _build_wikipedia_url(season, round_number, event_name)
+                for _, season, round_number, event_name in rows
+            ]
+            f1_urls = [
+                _build_f1_com_url(season, round_number) for _, season, round_number, _ in rows
+            ]
 
-                cur.execute(
-                    "UPDATE metadata.races_catalog "
-                    "SET wikipedia_url = %s, formula1_url = %s "
-                    "WHERE race_id = %s",
-                    (wiki_url, f1_url, race_id),
-                )
-                updated += 1
-
-            conn.commit()
+            cur.execute(
+                "UPDATE metadata.races_catalog AS c "
+                "SET wikipedia_url = links.wikipedia_url, formula1_url = links.formula1_url "
+                "FROM unnest(%s::text[], %s::text[], %s::text[]) "
+                "AS links(race_id, wikipedia_url, formula1_url) "
+                "WHERE c.race_id = links.race_id "
+                # Rows already holding these URLs are left alone, so a re-run
+                # writes no new tuple versions (and no WAL) for them
+                "AND (c.wikipedia_url IS DISTINCT FROM links.wikipedia_url "
+                "OR c.formula1_url IS DISTINCT FROM links.formula1_url)",
+                (race_ids, wiki_urls, f1_urls),
+            )
+            updated = cur.rowcount
             print(f"Updated {updated} race(s) with external links.")
 
 